@@ -3,18 +3,27 @@ import librosa
 import numpy as np
 import speech_recognition as sr
 import logging
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+
+def build_recognizer() -> sr.Recognizer:
+    """Recognizer with a fixed energy threshold, so no per-call ambient calibration drift"""
+    recognizer = sr.Recognizer()
+    recognizer.dynamic_energy_threshold = False
+    recognizer.energy_threshold = 300
+    return recognizer
+
 class VoiceAnalyzer:
     """
     Analyzes voice audio for Ayurvedic Dosha detection using acoustic features.
     Extracts Pitch, Energy, Spectral Centroid, and Speaking Rate.
     """
 
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
+    def __init__(self, recognizer: Optional[sr.Recognizer] = None):
+        # One recognizer is shared by all calls; recognize_google keeps no per-call state on it
+        self.recognizer = recognizer if recognizer is not None else build_recognizer()
 
     def analyze(self, audio_path: str) -> Dict[str, Any]:
         """
@@ -1,6 +1,6 @@
 # backend/app/api/api_v1/endpoints/voice.py
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from typing import Optional, Dict, Any
 import tempfile
 import os
@@ -60,36 +60,28 @@ async def convert_text_to_speech(
     text: str = Form(...),
     language: str = Form("en"),
     voice_type: str = Form("female")
-) -> Dict[str, Any]:
-    """Convert text to speech audio"""
+) -> Response:
+    """Convert text to speech audio; new phrases stream as MP3 while synthesized, repeats come from cache"""
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Empty text provided")
+    
+    # Repeated phrases are served straight from the TTS cache
+    cached_path = voice_service.cached_tts_path(text, language, voice_type)
+    if cached_path is not None:
+        return FileResponse(cached_path, media_type="audio/mpeg")
+    
     try:
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="Empty text provided")
-        
-        # Convert text to speech
-        result = await voice_service.text_to_speech(text, language, voice_type)
-        
-        if not result['success']:
-            raise HTTPException(
-                status_code=400,
-                detail=result.get('error', 'Text-to-speech conversion failed')
-            )
-        
-        return {
-            "success": True,
-            "audio_path": result['audio_path'],
-            "language": result['language'],
-            "voice_type": result['voice_type'],
-            "duration": result.get('duration', 0.0),
-            "method": result.get('method', 'unknown'),
-            "note": result.get('note', '')
-        }
-        
-    except HTTPException:
-        raise
+        audio_stream = voice_service.text_to_speech_stream(text, language, voice_type)
+    except ImportError:
+        logger.warning("gTTS not installed. Install with: pip install gtts")
+        raise HTTPException(status_code=503, detail="TTS library not installed")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Text-to-speech error: {e}")
         raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+    
+    return StreamingResponse(audio_stream, media_type="audio/mpeg")
 
 @router.post("/voice-consultation")
 async def voice_guided_consultation(
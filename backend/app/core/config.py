@@ -48,6 +48,7 @@ class Settings(BaseSettings):
     # AI Models
     MODEL_DIR: str = os.getenv("MODEL_DIR", "./ml_models")
     USE_GPU: bool = os.getenv("USE_GPU", "False").lower() == "true"
+    PULSE_TORCH_COMPILE: bool = os.getenv("PULSE_TORCH_COMPILE", "False").lower() == "true"
     
     # Gemini API
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
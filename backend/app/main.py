@@ -10,12 +10,10 @@ from app.api.api_v1.api import api_router
 from app.core.config import settings
 from app.core.database import engine, Base
 from app.core.middleware import log_requests
+from app.utils.logger import setup_logging, shutdown_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)s | %(name)s | %(filename)s:%(lineno)d | %(message)s'
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -103,6 +101,7 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down gracefully...")
+    shutdown_logging()
 
 if __name__ == "__main__":
     import uvicorn
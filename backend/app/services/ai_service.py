@@ -72,7 +72,7 @@ class AIService:
                 }
             
             # Run analysis with expected BPM
-            analysis = self.pulse_service.analyze_pulse(pulse_data, expected_bpm=heart_rate)
+            analysis = await self.pulse_service.analyze_pulse_async(pulse_data, expected_bpm=heart_rate)
             
             # Translate if needed
             if locale != "en":
@@ -3,23 +3,103 @@ PDF Report Generation Service
 Creates professional PDF reports for Ayurvedic consultations
 """
 
+import copy
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Any
 from datetime import datetime
 from pathlib import Path
+from xml.sax.saxutils import escape as xml_escape
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    PageBreak, Image, KeepTogether
+    BaseDocTemplate, PageTemplate, Frame, Paragraph,
+    Spacer, Table, TableStyle, PageBreak, Image, KeepTogether
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Max number of memoized section flowable lists
+SECTION_CACHE_SIZE = 256
+
+# Name of the form XObject holding the static page footer
+FOOTER_FORM_NAME = 'aayur_footer'
+
+
+def _register_report_fonts():
+    """
+    Register a Unicode TTF family for reports (subset on embed)
+    
+    Returns:
+        Tuple of (regular, bold) font names, falling back to Helvetica
+        when DejaVuSans is not available
+    """
+    possible_font_dirs = [
+        Path("static/fonts"),
+        Path("fonts"),
+        Path("/usr/share/fonts/truetype/dejavu"),
+        Path("/usr/share/fonts/dejavu"),
+    ]
+    
+    for font_dir in possible_font_dirs:
+        regular = font_dir / "DejaVuSans.ttf"
+        bold = font_dir / "DejaVuSans-Bold.ttf"
+        if regular.exists() and bold.exists():
+            try:
+                pdfmetrics.registerFont(TTFont('AayurSans', str(regular)))
+                pdfmetrics.registerFont(TTFont('AayurSans-Bold', str(bold)))
+                pdfmetrics.registerFontFamily(
+                    'AayurSans', normal='AayurSans', bold='AayurSans-Bold',
+                    italic='AayurSans', boldItalic='AayurSans-Bold'
+                )
+                logger.info(f"Report font registered from: {font_dir}")
+                return 'AayurSans', 'AayurSans-Bold'
+            except Exception as e:
+                logger.warning(f"Failed to register report font: {e}")
+    
+    logger.warning("DejaVuSans font not found, falling back to Helvetica")
+    return 'Helvetica', 'Helvetica-Bold'
+
+
+FONT_REGULAR, FONT_BOLD = _register_report_fonts()
+
+
+def _clean(seq, n):
+    """Return up to n non-empty items of a list as strings (empty tuple for non-lists)"""
+    if not isinstance(seq, (list, tuple)):
+        return ()
+    return tuple(str(item) for item in seq[:n] if item)
+
+# Shared style for two-column label/value characteristic tables
+CHARACTERISTICS_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), FONT_BOLD),
+    ('FONTNAME', (1, 0), (1, -1), FONT_REGULAR),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#334155')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+])
+
 
 class PDFReportService:
     """Service for generating professional PDF reports"""
@@ -46,6 +126,10 @@ class PDFReportService:
         if not self.logo_path:
             logger.warning("Logo file not found, will use text header")
         
+        # Memoized section flowables keyed by (section, content hash)
+        self._section_cache: OrderedDict = OrderedDict()
+        self._section_cache_lock = threading.Lock()
+        
         logger.info("PDFReportService initialized")
     
     def generate_pdf_report(self, diagnosis_data: Dict[str, Any], user_info: Dict[str, Any] = None) -> str:
@@ -64,22 +148,12 @@ class PDFReportService:
             logger.info(f"Diagnosis data keys: {list(diagnosis_data.keys())}")
             
             # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.time_ns()
             filename = f"AayurAI_Report_{timestamp}.pdf"
             filepath = self.reports_dir / filename
             
             logger.info(f"PDF will be saved to: {filepath}")
             
-            # Create PDF document
-            doc = SimpleDocTemplate(
-                str(filepath),
-                pagesize=letter,
-                rightMargin=0.75*inch,
-                leftMargin=0.75*inch,
-                topMargin=1*inch,
-                bottomMargin=0.75*inch
-            )
-            
             # Build content
             story = []
             styles = self._get_styles()
@@ -87,58 +161,73 @@ class PDFReportService:
             logger.info("Adding header section")
             # Add header
             story.extend(self._create_header(styles, user_info))
-            story.append(Spacer(1, 0.3*inch))
             
             logger.info("Adding executive summary")
             # Add executive summary
             story.extend(self._create_executive_summary(diagnosis_data, styles))
-            story.append(Spacer(1, 0.2*inch))
             
             logger.info("Adding dosha analysis")
             # Add dosha analysis
             story.extend(self._create_dosha_analysis(diagnosis_data, styles))
-            story.append(Spacer(1, 0.2*inch))
             
             # Add detailed analysis sections
             if diagnosis_data.get('pulse_analysis'):
                 logger.info("Adding pulse analysis")
-                story.extend(self._create_pulse_section(diagnosis_data['pulse_analysis'], styles))
-                story.append(Spacer(1, 0.2*inch))
+                story.extend(self._cached_section('pulse', self._create_pulse_section, diagnosis_data['pulse_analysis'], styles))
             
             if diagnosis_data.get('tongue_analysis'):
                 logger.info("Adding tongue analysis")
-                story.extend(self._create_tongue_section(diagnosis_data['tongue_analysis'], styles))
-                story.append(Spacer(1, 0.2*inch))
+                story.extend(self._cached_section('tongue', self._create_tongue_section, diagnosis_data['tongue_analysis'], styles))
             
             if diagnosis_data.get('symptom_analysis'):
                 logger.info("Adding symptom analysis")
-                story.extend(self._create_symptom_section(diagnosis_data['symptom_analysis'], styles))
-                story.append(Spacer(1, 0.2*inch))
+                story.extend(self._cached_section('symptom', self._create_symptom_section, diagnosis_data['symptom_analysis'], styles))
             
             # Add fusion details
             if diagnosis_data.get('fusion_details'):
                 logger.info("Adding fusion analysis")
-                story.extend(self._create_fusion_section(diagnosis_data['fusion_details'], styles))
-                story.append(Spacer(1, 0.2*inch))
+                story.extend(self._cached_section('fusion', self._create_fusion_section, diagnosis_data['fusion_details'], styles))
             
             # Add recommendations
             logger.info("Adding recommendations")
             story.extend(self._create_recommendations(diagnosis_data, styles))
-            story.append(Spacer(1, 0.2*inch))
             
             # Add home remedies
             if diagnosis_data.get('home_remedies'):
                 logger.info("Adding home remedies")
-                story.extend(self._create_remedies_section(diagnosis_data['home_remedies'], styles))
-                story.append(Spacer(1, 0.2*inch))
+                story.extend(self._cached_section('remedies', self._create_remedies_section, diagnosis_data['home_remedies'], styles))
             
             # Add disclaimer
             logger.info("Adding disclaimer")
             story.extend(self._create_disclaimer(styles))
             
-            # Build PDF
+            # Build PDF into a temp file and atomically move it into place,
+            # so a crash mid-build never leaves a truncated report behind
             logger.info("Building PDF document")
-            doc.build(story, onFirstPage=self._add_page_number, onLaterPages=self._add_page_number)
+            tmp_path = filepath.with_suffix(".pdf.tmp")
+            try:
+                with open(tmp_path, "wb", buffering=262144) as fh:
+                    doc = BaseDocTemplate(
+                        fh,
+                        pagesize=letter,
+                        rightMargin=0.75*inch,
+                        leftMargin=0.75*inch,
+                        topMargin=1*inch,
+                        bottomMargin=0.75*inch
+                    )
+                    # Frames keep layout state during a build, so each document gets its own
+                    doc.addPageTemplates([PageTemplate(
+                        'main',
+                        [Frame(0.75*inch, 0.75*inch, letter[0] - 1.5*inch, letter[1] - 1.75*inch)],
+                        onPage=self._add_page_number
+                    )])
+                    doc.build(story)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                os.replace(tmp_path, filepath)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
             
             logger.info(f"PDF report generated successfully: {filepath}")
             return str(filepath)
@@ -147,6 +236,55 @@ class PDFReportService:
             logger.error(f"Failed to generate PDF report: {e}", exc_info=True)
             raise
     
+    def _section_key(self, section_data) -> str:
+        """Compute a stable content hash for a section's input data"""
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(
+                section_data,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                default=str
+            )
+        else:
+            payload = json.dumps(section_data, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _cached_section(self, name, builder, section_data, styles):
+        """
+        Build a report section, reusing flowables for identical input
+        
+        Args:
+            name: Section name (part of the cache key)
+            builder: Section builder method, called as builder(section_data, styles)
+            section_data: Section input dict/list
+            styles: Paragraph styles
+            
+        Returns:
+            List of flowables for the section
+        """
+        try:
+            key = (name, self._section_key(section_data))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Section '{name}' not cacheable: {e}")
+            return builder(section_data, styles)
+        
+        # Layout state (wrap results, postponement flags) is stored on the
+        # flowable itself, so hand out shallow copies of pristine instances
+        # Reports are generated from worker threads, so the LRU is only touched under the lock
+        with self._section_cache_lock:
+            cached = self._section_cache.get(key)
+            if cached is not None:
+                self._section_cache.move_to_end(key)
+        if cached is not None:
+            return [copy.copy(element) for element in cached]
+        
+        elements = builder(section_data, styles)
+        pristine = tuple(copy.copy(element) for element in elements)
+        with self._section_cache_lock:
+            self._section_cache[key] = pristine
+            if len(self._section_cache) > SECTION_CACHE_SIZE:
+                self._section_cache.popitem(last=False)
+        return elements
+    
     def _get_styles(self):
         """Get custom paragraph styles"""
         styles = getSampleStyleSheet()
@@ -159,7 +297,7 @@ class PDFReportService:
             textColor=colors.HexColor('#0ea5e9'),
             spaceAfter=12,
             alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
+            fontName=FONT_BOLD
         ))
         
         # Heading style
@@ -170,7 +308,15 @@ class PDFReportService:
             textColor=colors.HexColor('#1e293b'),
             spaceAfter=10,
             spaceBefore=10,
-            fontName='Helvetica-Bold'
+            fontName=FONT_BOLD
+        ))
+        
+        # Section heading style - spaceBefore replaces a separate Spacer
+        # flowable between report sections
+        styles.add(ParagraphStyle(
+            name='SectionHeading',
+            parent=styles['CustomHeading'],
+            spaceBefore=10 + 0.2*inch
         ))
         
         # Subheading style
@@ -180,7 +326,8 @@ class PDFReportService:
             fontSize=13,
             textColor=colors.HexColor('#475569'),
             spaceAfter=8,
-            fontName='Helvetica-Bold'
+            spaceBefore=0.1*inch,
+            fontName=FONT_BOLD
         ))
         
         # Body style
@@ -190,7 +337,8 @@ class PDFReportService:
             fontSize=11,
             textColor=colors.HexColor('#334155'),
             spaceAfter=6,
-            alignment=TA_JUSTIFY
+            alignment=TA_JUSTIFY,
+            fontName=FONT_REGULAR
         ))
         
         # Highlight style
@@ -199,7 +347,7 @@ class PDFReportService:
             parent=styles['BodyText'],
             fontSize=12,
             textColor=colors.HexColor('#0ea5e9'),
-            fontName='Helvetica-Bold'
+            fontName=FONT_BOLD
         ))
         
         return styles
@@ -229,9 +377,9 @@ class PDFReportService:
         
         if user_info:
             if user_info.get('full_name'):
-                elements.append(Paragraph(f"<b>Patient Name:</b> {user_info['full_name']}", styles['CustomBody']))
+                elements.append(Paragraph(f"<b>Patient Name:</b> {xml_escape(str(user_info['full_name']))}", styles['CustomBody']))
             if user_info.get('email'):
-                elements.append(Paragraph(f"<b>Email:</b> {user_info['email']}", styles['CustomBody']))
+                elements.append(Paragraph(f"<b>Email:</b> {xml_escape(str(user_info['email']))}", styles['CustomBody']))
         
         # Horizontal line
         elements.append(Spacer(1, 0.1*inch))
@@ -242,7 +390,7 @@ class PDFReportService:
         """Create executive summary section"""
         elements = []
         
-        elements.append(Paragraph("Executive Summary", styles['CustomHeading']))
+        elements.append(Paragraph("Executive Summary", styles['SectionHeading']))
         
         # Extract dosha info - handle both formats with defaults
         primary_dosha = data.get('primary_dosha') or data.get('dominant_dosha') or 'Unknown'
@@ -257,7 +405,7 @@ class PDFReportService:
         
         summary_text = f"""
         Based on comprehensive AI-powered analysis of pulse, tongue, and symptoms, 
-        your primary dosha is <b>{str(primary_dosha).upper()}</b> with <b>{str(imbalance_level)}</b> level of imbalance.
+        your primary dosha is <b>{xml_escape(str(primary_dosha).upper())}</b> with <b>{xml_escape(str(imbalance_level))}</b> level of imbalance.
         The AI system has <b>{confidence*100:.1f}% confidence</b> in this assessment.
         This report provides personalized recommendations to restore balance and improve your health.
         """
@@ -267,9 +415,9 @@ class PDFReportService:
         # Add patient info if available
         if data.get('patient_info'):
             patient = data['patient_info']
-            name = patient.get('name', 'N/A')
-            age = patient.get('age', 'N/A')
-            gender = patient.get('gender', 'N/A')
+            name = xml_escape(str(patient.get('name', 'N/A')))
+            age = xml_escape(str(patient.get('age', 'N/A')))
+            gender = xml_escape(str(patient.get('gender', 'N/A')))
             elements.append(Spacer(1, 0.1*inch))
             elements.append(Paragraph(f"<b>Patient:</b> {name}, Age: {age}, Gender: {gender}", styles['CustomBody']))
         
@@ -279,7 +427,7 @@ class PDFReportService:
         """Create dosha analysis section with table"""
         elements = []
         
-        elements.append(Paragraph("Dosha Analysis", styles['CustomHeading']))
+        elements.append(Paragraph("Dosha Analysis", styles['SectionHeading']))
         
         # Get dosha scores - handle different formats
         dosha_scores = data.get('dosha_scores', {})
@@ -318,12 +466,12 @@ class PDFReportService:
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0ea5e9')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
             ('FONTSIZE', (0, 0), (-1, 0), 12),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
             ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
             ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTNAME', (0, 1), (-1, -1), FONT_REGULAR),
             ('FONTSIZE', (0, 1), (-1, -1), 10),
             ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
         ]))
@@ -333,7 +481,7 @@ class PDFReportService:
         # Add explanation if available
         if data.get('explanation'):
             elements.append(Spacer(1, 0.1*inch))
-            elements.append(Paragraph(f"<b>Analysis:</b> {data['explanation']}", styles['CustomBody']))
+            elements.append(Paragraph(f"<b>Analysis:</b> {xml_escape(str(data['explanation']))}", styles['CustomBody']))
         
         return elements
     
@@ -341,7 +489,7 @@ class PDFReportService:
         """Create pulse analysis section"""
         elements = []
         
-        elements.append(Paragraph("Pulse Analysis (Nadi Pariksha)", styles['CustomHeading']))
+        elements.append(Paragraph("Pulse Analysis (Nadi Pariksha)", styles['SectionHeading']))
         
         if not pulse_data:
             elements.append(Paragraph("Pulse analysis data not available", styles['CustomBody']))
@@ -354,47 +502,44 @@ class PDFReportService:
             # Traditional characteristics
             if ayurvedic.get('traditional_characteristics'):
                 chars = ayurvedic['traditional_characteristics']
-                elements.append(Paragraph(f"<b>Gati (Movement):</b> {chars.get('gati', 'N/A')}", styles['CustomBody']))
-                elements.append(Paragraph(f"<b>Speed:</b> {chars.get('speed', 'N/A')}", styles['CustomBody']))
-                elements.append(Paragraph(f"<b>Force:</b> {chars.get('force', 'N/A')}", styles['CustomBody']))
-                elements.append(Paragraph(f"<b>Rhythm:</b> {chars.get('rhythm', 'N/A')}", styles['CustomBody']))
+                rows = [
+                    ['Gati (Movement):', str(chars.get('gati', 'N/A'))],
+                    ['Speed:', str(chars.get('speed', 'N/A'))],
+                    ['Force:', str(chars.get('force', 'N/A'))],
+                    ['Rhythm:', str(chars.get('rhythm', 'N/A'))],
+                ]
+                table = Table(rows, colWidths=[1.5*inch, 4*inch], hAlign='LEFT')
+                table.setStyle(CHARACTERISTICS_TABLE_STYLE)
+                elements.append(table)
             
             # Interpretation
             if ayurvedic.get('interpretation'):
-                elements.append(Spacer(1, 0.1*inch))
                 elements.append(Paragraph("<b>Interpretation:</b>", styles['CustomSubheading']))
-                elements.append(Paragraph(str(ayurvedic['interpretation']), styles['CustomBody']))
+                elements.append(Paragraph(xml_escape(str(ayurvedic['interpretation'])), styles['CustomBody']))
             
             # Insights
-            if ayurvedic.get('ayurvedic_insights'):
-                insights = ayurvedic['ayurvedic_insights']
-                if isinstance(insights, list) and len(insights) > 0:
-                    elements.append(Spacer(1, 0.1*inch))
-                    elements.append(Paragraph("<b>Ayurvedic Insights:</b>", styles['CustomSubheading']))
-                    for insight in insights[:5]:
-                        if insight:
-                            elements.append(Paragraph(f"• {str(insight)}", styles['CustomBody']))
+            insights = _clean(ayurvedic.get('ayurvedic_insights'), 5)
+            if insights:
+                elements.append(Paragraph("<b>Ayurvedic Insights:</b>", styles['CustomSubheading']))
+                for insight in insights:
+                    elements.append(Paragraph(f"• {xml_escape(insight)}", styles['CustomBody']))
             
             # Recommendations
-            if ayurvedic.get('recommendations'):
-                recs = ayurvedic['recommendations']
-                if isinstance(recs, list) and len(recs) > 0:
-                    elements.append(Spacer(1, 0.1*inch))
-                    elements.append(Paragraph("<b>Pulse-Based Recommendations:</b>", styles['CustomSubheading']))
-                    for rec in recs[:5]:
-                        if rec:
-                            elements.append(Paragraph(f"• {str(rec)}", styles['CustomBody']))
+            recs = _clean(ayurvedic.get('recommendations'), 5)
+            if recs:
+                elements.append(Paragraph("<b>Pulse-Based Recommendations:</b>", styles['CustomSubheading']))
+                for rec in recs:
+                    elements.append(Paragraph(f"• {xml_escape(rec)}", styles['CustomBody']))
         
         # ML predictions - check both possible keys
         probs = pulse_data.get('probabilities') or pulse_data.get('dosha_probabilities')
         if probs:
-            elements.append(Spacer(1, 0.1*inch))
             elements.append(Paragraph("<b>AI Predictions:</b>", styles['CustomSubheading']))
             for dosha, prob in probs.items():
                 if prob is not None:
                     try:
                         prob_val = float(prob)
-                        elements.append(Paragraph(f"{str(dosha).capitalize()}: {prob_val*100:.1f}%", styles['CustomBody']))
+                        elements.append(Paragraph(f"{xml_escape(str(dosha).capitalize())}: {prob_val*100:.1f}%", styles['CustomBody']))
                     except (TypeError, ValueError):
                         pass
         
@@ -404,7 +549,7 @@ class PDFReportService:
         """Create tongue analysis section"""
         elements = []
         
-        elements.append(Paragraph("Tongue Analysis (Jihva Pariksha)", styles['CustomHeading']))
+        elements.append(Paragraph("Tongue Analysis (Jihva Pariksha)", styles['SectionHeading']))
         
         if not tongue_data:
             elements.append(Paragraph("Tongue analysis data not available", styles['CustomBody']))
@@ -412,9 +557,14 @@ class PDFReportService:
         
         if tongue_data.get('features'):
             features = tongue_data['features']
-            elements.append(Paragraph(f"<b>Color:</b> {features.get('color', 'N/A')}", styles['CustomBody']))
-            elements.append(Paragraph(f"<b>Coating:</b> {features.get('coating', 'N/A')}", styles['CustomBody']))
-            elements.append(Paragraph(f"<b>Texture:</b> {features.get('texture', 'N/A')}", styles['CustomBody']))
+            rows = [
+                ['Color:', str(features.get('color', 'N/A'))],
+                ['Coating:', str(features.get('coating', 'N/A'))],
+                ['Texture:', str(features.get('texture', 'N/A'))],
+            ]
+            table = Table(rows, colWidths=[1.5*inch, 4*inch], hAlign='LEFT')
+            table.setStyle(CHARACTERISTICS_TABLE_STYLE)
+            elements.append(table)
         else:
             elements.append(Paragraph("Tongue features not available", styles['CustomBody']))
         
@@ -424,21 +574,17 @@ class PDFReportService:
         """Create symptom analysis section"""
         elements = []
         
-        elements.append(Paragraph("Symptom Analysis", styles['CustomHeading']))
+        elements.append(Paragraph("Symptom Analysis", styles['SectionHeading']))
         
         if not symptom_data:
             elements.append(Paragraph("Symptom analysis data not available", styles['CustomBody']))
             return elements
         
-        if symptom_data.get('symptoms'):
-            symptoms = symptom_data['symptoms']
-            if isinstance(symptoms, list) and len(symptoms) > 0:
-                elements.append(Paragraph("<b>Reported Symptoms:</b>", styles['CustomSubheading']))
-                for symptom in symptoms[:10]:
-                    if symptom:
-                        elements.append(Paragraph(f"• {str(symptom)}", styles['CustomBody']))
-            else:
-                elements.append(Paragraph("No symptoms reported", styles['CustomBody']))
+        symptoms = _clean(symptom_data.get('symptoms'), 10)
+        if symptoms:
+            elements.append(Paragraph("<b>Reported Symptoms:</b>", styles['CustomSubheading']))
+            for symptom in symptoms:
+                elements.append(Paragraph(f"• {xml_escape(symptom)}", styles['CustomBody']))
         else:
             elements.append(Paragraph("No symptoms reported", styles['CustomBody']))
         
@@ -448,7 +594,7 @@ class PDFReportService:
         """Create fusion analysis section"""
         elements = []
         
-        elements.append(Paragraph("AI Fusion Analysis", styles['CustomHeading']))
+        elements.append(Paragraph("AI Fusion Analysis", styles['SectionHeading']))
         
         # Weights used
         if fusion_data.get('weights_used'):
@@ -459,11 +605,10 @@ class PDFReportService:
             elements.append(Paragraph(text, styles['CustomBody']))
             
             for modality, weight in weights.items():
-                elements.append(Paragraph(f"• {modality.capitalize()}: {weight*100:.0f}%", styles['CustomBody']))
+                elements.append(Paragraph(f"• {xml_escape(str(modality).capitalize())}: {weight*100:.0f}%", styles['CustomBody']))
         
         # Source contributions
         if fusion_data.get('sources'):
-            elements.append(Spacer(1, 0.1*inch))
             elements.append(Paragraph("<b>Individual Modality Predictions:</b>", styles['CustomSubheading']))
             
             for modality, scores in fusion_data['sources'].items():
@@ -471,9 +616,9 @@ class PDFReportService:
                 if not any(v > 0 for v in scores.values()):
                     continue
                     
-                elements.append(Paragraph(f"<b>{modality.capitalize()}:</b>", styles['CustomBody']))
+                elements.append(Paragraph(f"<b>{xml_escape(str(modality).capitalize())}:</b>", styles['CustomBody']))
                 for dosha, score in scores.items():
-                    elements.append(Paragraph(f"  {dosha.capitalize()}: {score*100:.1f}%", styles['CustomBody']))
+                    elements.append(Paragraph(f"  {xml_escape(str(dosha).capitalize())}: {score*100:.1f}%", styles['CustomBody']))
         
         return elements
     
@@ -481,7 +626,7 @@ class PDFReportService:
         """Create recommendations section"""
         elements = []
         
-        elements.append(Paragraph("Personalized Recommendations", styles['CustomHeading']))
+        elements.append(Paragraph("Personalized Recommendations", styles['SectionHeading']))
         
         recommendations = data.get('recommendations', {})
         
@@ -490,33 +635,25 @@ class PDFReportService:
             return elements
         
         # Dietary recommendations
-        if recommendations.get('dietary'):
-            dietary = recommendations['dietary']
-            if isinstance(dietary, list) and len(dietary) > 0:
-                elements.append(Paragraph("<b>Dietary Guidelines:</b>", styles['CustomSubheading']))
-                for rec in dietary[:8]:
-                    if rec:  # Skip None or empty strings
-                        elements.append(Paragraph(f"• {str(rec)}", styles['CustomBody']))
-                elements.append(Spacer(1, 0.1*inch))
+        dietary = _clean(recommendations.get('dietary'), 8)
+        if dietary:
+            elements.append(Paragraph("<b>Dietary Guidelines:</b>", styles['CustomSubheading']))
+            for rec in dietary:
+                elements.append(Paragraph(f"• {xml_escape(rec)}", styles['CustomBody']))
         
         # Lifestyle recommendations
-        if recommendations.get('lifestyle'):
-            lifestyle = recommendations['lifestyle']
-            if isinstance(lifestyle, list) and len(lifestyle) > 0:
-                elements.append(Paragraph("<b>Lifestyle Modifications:</b>", styles['CustomSubheading']))
-                for rec in lifestyle[:8]:
-                    if rec:  # Skip None or empty strings
-                        elements.append(Paragraph(f"• {str(rec)}", styles['CustomBody']))
-                elements.append(Spacer(1, 0.1*inch))
+        lifestyle = _clean(recommendations.get('lifestyle'), 8)
+        if lifestyle:
+            elements.append(Paragraph("<b>Lifestyle Modifications:</b>", styles['CustomSubheading']))
+            for rec in lifestyle:
+                elements.append(Paragraph(f"• {xml_escape(rec)}", styles['CustomBody']))
         
         # Yoga recommendations
-        if recommendations.get('yoga'):
-            yoga = recommendations['yoga']
-            if isinstance(yoga, list) and len(yoga) > 0:
-                elements.append(Paragraph("<b>Yoga & Exercise:</b>", styles['CustomSubheading']))
-                for rec in yoga[:6]:
-                    if rec:  # Skip None or empty strings
-                        elements.append(Paragraph(f"• {str(rec)}", styles['CustomBody']))
+        yoga = _clean(recommendations.get('yoga'), 6)
+        if yoga:
+            elements.append(Paragraph("<b>Yoga & Exercise:</b>", styles['CustomSubheading']))
+            for rec in yoga:
+                elements.append(Paragraph(f"• {xml_escape(rec)}", styles['CustomBody']))
         
         return elements
     
@@ -524,34 +661,33 @@ class PDFReportService:
         """Create home remedies section"""
         elements = []
         
-        elements.append(Paragraph("Ayurvedic Home Remedies", styles['CustomHeading']))
+        elements.append(Paragraph("Ayurvedic Home Remedies", styles['SectionHeading']))
         
         # Handle both list and detailed remedy formats
         if isinstance(remedies, list):
             if remedies and isinstance(remedies[0], dict):
                 # Detailed remedies with name, ingredients, etc.
                 for remedy in remedies[:5]:
-                    elements.append(Paragraph(f"<b>{remedy.get('name', 'Remedy')}</b>", styles['CustomSubheading']))
+                    elements.append(Paragraph(f"<b>{xml_escape(str(remedy.get('name', 'Remedy')))}</b>", styles['CustomSubheading']))
                     
-                    if remedy.get('ingredients'):
+                    ingredients = _clean(remedy.get('ingredients'), 5)
+                    if ingredients:
                         elements.append(Paragraph("<b>Ingredients:</b>", styles['CustomBody']))
-                        for ing in remedy['ingredients'][:5]:
-                            elements.append(Paragraph(f"• {ing}", styles['CustomBody']))
+                        for ing in ingredients:
+                            elements.append(Paragraph(f"• {xml_escape(ing)}", styles['CustomBody']))
                     
                     if remedy.get('preparation'):
-                        elements.append(Paragraph(f"<b>Preparation:</b> {remedy['preparation']}", styles['CustomBody']))
+                        elements.append(Paragraph(f"<b>Preparation:</b> {xml_escape(str(remedy['preparation']))}", styles['CustomBody']))
                     
                     if remedy.get('usage'):
-                        elements.append(Paragraph(f"<b>Usage:</b> {remedy['usage']}", styles['CustomBody']))
+                        elements.append(Paragraph(f"<b>Usage:</b> {xml_escape(str(remedy['usage']))}", styles['CustomBody']))
                     
                     if remedy.get('benefits'):
-                        elements.append(Paragraph(f"<b>Benefits:</b> {remedy['benefits']}", styles['CustomBody']))
-                    
-                    elements.append(Spacer(1, 0.1*inch))
+                        elements.append(Paragraph(f"<b>Benefits:</b> {xml_escape(str(remedy['benefits']))}", styles['CustomBody']))
             else:
                 # Simple list of remedies
-                for remedy in remedies[:10]:
-                    elements.append(Paragraph(f"• {remedy}", styles['CustomBody']))
+                for remedy in _clean(remedies, 10):
+                    elements.append(Paragraph(f"• {xml_escape(remedy)}", styles['CustomBody']))
         
         return elements
     
@@ -559,8 +695,7 @@ class PDFReportService:
         """Create disclaimer section"""
         elements = []
         
-        elements.append(Spacer(1, 0.3*inch))
-        elements.append(Paragraph("Important Disclaimer", styles['CustomHeading']))
+        elements.append(Paragraph("Important Disclaimer", styles['SectionHeading']))
         
         disclaimer_text = """
         This report is generated by AayurAI's artificial intelligence system and is intended for 
@@ -577,13 +712,20 @@ class PDFReportService:
     
     def _add_page_number(self, canvas, doc):
         """Add page number to each page"""
-        page_num = canvas.getPageNumber()
-        text = f"Page {page_num}"
+        # Static footer text is drawn once per document into a form XObject
+        # and referenced from every page
+        if not canvas.hasForm(FOOTER_FORM_NAME):
+            canvas.beginForm(FOOTER_FORM_NAME)
+            canvas.setFont(FONT_REGULAR, 9)
+            canvas.setFillColor(colors.grey)
+            canvas.drawString(1*inch, 0.5*inch, "AayurAI - Ayurvedic Health Assessment")
+            canvas.endForm()
+        
+        canvas.doForm(FOOTER_FORM_NAME)
         canvas.saveState()
-        canvas.setFont('Helvetica', 9)
+        canvas.setFont(FONT_REGULAR, 9)
         canvas.setFillColor(colors.grey)
-        canvas.drawRightString(7.5*inch, 0.5*inch, text)
-        canvas.drawString(1*inch, 0.5*inch, "AayurAI - Ayurvedic Health Assessment")
+        canvas.drawRightString(7.5*inch, 0.5*inch, f"Page {canvas.getPageNumber()}")
         canvas.restoreState()
 
 
@@ -3,21 +3,115 @@ import torch
 import numpy as np
 import os
 import logging
-from scipy.signal import butter, filtfilt, find_peaks
+import asyncio
+import threading
+import scipy.fft
+from scipy.signal import butter, sosfiltfilt, find_peaks
 from typing import Dict, Any, List
 
 from app.ai_models.pulse.pulse_model import PulseBiLSTM
 from app.ai_models.pulse.dosha_mapper import AyurvedicPulseMapper
 from app.core.config import settings
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+try:
+    import tensorrt as trt
+    TENSORRT_AVAILABLE = True
+except ImportError:
+    trt = None
+    TENSORRT_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Model input window: 10s at 125 Hz
+PULSE_WINDOW_SIZE = 1250
+PULSE_NUM_CLASSES = 4
+DOSHA_LABELS = ("Vata", "Pitta", "Kapha", "Balanced")
+
+# Micro-batching of concurrent async requests
+PULSE_MAX_BATCH = 16
+PULSE_BATCH_WINDOW_S = 0.008
+
+
+def _sampen_counts(data, m, r):
+    """
+    Count template matches for Sample Entropy in a single pass.
+    
+    Returns (B, A): unordered pairs of length-m templates (over N-m
+    templates) within Chebyshev distance r, and pairs of length-(m+1)
+    templates (over N-m-1 templates) within r.
+    """
+    N = data.shape[0]
+    n_m = N - m
+    B = 0
+    A = 0
+    for i in range(n_m):
+        for j in range(i + 1, n_m):
+            d = 0.0
+            for k in range(m):
+                diff = abs(data[i + k] - data[j + k])
+                if diff > d:
+                    d = diff
+            if d <= r:
+                B += 1
+                if j < n_m - 1 and abs(data[i + m] - data[j + m]) <= r:
+                    A += 1
+    return B, A
+
+
+if NUMBA_AVAILABLE:
+    _sampen_counts = njit(cache=True, fastmath=True)(_sampen_counts)
+
+
+# HRV band edges in Hz: VLF [0.003, 0.04), LF [0.04, 0.15), HF [0.15, 0.4)
+HRV_BAND_EDGES = (0.003, 0.04, 0.15, 0.4)
+
+
+def _hrv_band_bins(n: int, mean_rr: float) -> np.ndarray:
+    """rfft bin index of each HRV band edge for an n-point FFT at the given RR spacing"""
+    freqs = scipy.fft.rfftfreq(n, d=mean_rr)
+    return np.searchsorted(freqs, HRV_BAND_EDGES)
+
+
+class _MainLogits(torch.nn.Module):
+    """Expose only the main classifier logits (for ONNX export)"""
+    
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+    
+    def forward(self, x: torch.Tensor, features: torch.Tensor) -> torch.Tensor:
+        return self.model(x, features)['main']
+
+
 class PulseService:
     def __init__(self):
         self.model = None
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self._use_half = False
+        self._trt_engine = None
+        self._trt_context = None
+        self._batch_loop = None
+        self._batch_queue = None
+        self._batch_task = None
         self.sampling_rate = 125  # Default for BIDMC
         
+        # Reused input buffers for the synchronous path; pinned so the H2D copy can be non-blocking
+        pin = torch.cuda.is_available()
+        self._sig_buf = torch.zeros(1, 1, PULSE_WINDOW_SIZE, dtype=torch.float32, pin_memory=pin)
+        self._feat_buf = torch.zeros(1, 3, dtype=torch.float32, pin_memory=pin)
+        self._buf_lock = threading.Lock()
+        
+        # Bandpass coefficients depend only on the sampling rate
+        nyq = 0.5 * self.sampling_rate
+        self._sos = butter(3, [0.5 / nyq, 5.0 / nyq], btype="band", output="sos")
+        
     def load_model(self, model_path: str = None):
         """Load the trained model"""
         if model_path is None:
@@ -29,6 +123,10 @@ class PulseService:
             self.model = PulseBiLSTM(feature_dim=3) # Assuming feature_dim=3 as per training
             self.model.to(self.device)
             self.model.eval()
+            # Random weights: no compile, and never cache a TensorRT engine under the model's name
+            self._use_half = False
+            self._trt_engine = None
+            self._trt_context = None
             return
 
         try:
@@ -45,6 +143,147 @@ class PulseService:
         except Exception as e:
             logger.error(f"Failed to load pulse model: {e}")
             raise
+        
+        self._optimize_for_device(model_path)
+
+    def _optimize_for_device(self, model_path: str):
+        """
+        Prepare the fastest available inference path on CUDA:
+        a cached TensorRT FP16 engine, else torch.compile (when
+        PULSE_TORCH_COMPILE is set), else FP16 TorchScript
+        """
+        self._use_half = False
+        self._trt_engine = None
+        self._trt_context = None
+        if self.device.type != 'cuda':
+            if settings.PULSE_TORCH_COMPILE:
+                self._compile_model()
+            return
+        
+        if TENSORRT_AVAILABLE:
+            try:
+                self._load_trt_engine(model_path)
+                logger.info("Pulse model running on TensorRT (FP16)")
+                return
+            except Exception as e:
+                logger.warning(f"TensorRT engine unavailable, falling back to PyTorch: {e}")
+        
+        if settings.PULSE_TORCH_COMPILE and self._compile_model():
+            return
+        
+        try:
+            torch.set_float32_matmul_precision('high')
+            example_signal = torch.zeros(1, 1, PULSE_WINDOW_SIZE, dtype=torch.float16, device=self.device)
+            example_features = torch.zeros(1, 3, dtype=torch.float16, device=self.device)
+            with torch.no_grad():
+                self.model = torch.jit.trace(
+                    self.model.half(), (example_signal, example_features), strict=False
+                )
+            self._use_half = True
+            logger.info("Pulse model traced to TorchScript (FP16)")
+        except Exception as e:
+            logger.warning(f"FP16 TorchScript tracing failed, using FP32 model: {e}")
+            self.model.float()
+
+    def _compile_model(self) -> bool:
+        """
+        Wrap the model with torch.compile and warm it up on the fixed input shapes
+        so the compiled graph (CUDA graphs on GPU) is captured before serving
+        """
+        if not hasattr(torch, 'compile'):
+            return False
+        
+        use_half = self.device.type == 'cuda'
+        dtype = torch.float16 if use_half else torch.float32
+        eager_model = self.model.half() if use_half else self.model
+        try:
+            compiled = torch.compile(eager_model, mode='reduce-overhead', fullgraph=False)
+            example_signal = torch.zeros(1, 1, PULSE_WINDOW_SIZE, dtype=dtype, device=self.device)
+            example_features = torch.zeros(1, 3, dtype=dtype, device=self.device)
+            with torch.no_grad():
+                for _ in range(2):
+                    compiled(example_signal, example_features)
+        except Exception as e:
+            logger.warning(f"torch.compile failed, using eager model: {e}")
+            self.model = eager_model.float()
+            return False
+        
+        self.model = compiled
+        self._use_half = use_half
+        logger.info(f"Pulse model compiled with torch.compile ({'FP16' if use_half else 'FP32'})")
+        return True
+
+    def _load_trt_engine(self, model_path: str):
+        """Load (building if needed) a TensorRT engine cached next to the model"""
+        gpu_name = torch.cuda.get_device_name(self.device).replace(' ', '_')
+        base_path = os.path.splitext(model_path)[0]
+        # Keyed on the checkpoint's size and mtime so a retrained model never reuses a stale engine
+        stat = os.stat(model_path)
+        checkpoint_id = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        engine_path = f"{base_path}_{gpu_name}_{PULSE_WINDOW_SIZE}_{checkpoint_id}.trt"
+        
+        if os.path.exists(engine_path):
+            with open(engine_path, 'rb') as f:
+                serialized = f.read()
+        else:
+            onnx_path = f"{base_path}.onnx"
+            example_signal = torch.zeros(1, 1, PULSE_WINDOW_SIZE, device=self.device)
+            example_features = torch.zeros(1, 3, device=self.device)
+            torch.onnx.export(
+                _MainLogits(self.model), (example_signal, example_features), onnx_path,
+                input_names=['signal', 'features'], output_names=['main'], opset_version=17
+            )
+            serialized = self._build_trt_engine(onnx_path, engine_path)
+        
+        trt_logger = trt.Logger(trt.Logger.WARNING)
+        self._trt_engine = trt.Runtime(trt_logger).deserialize_cuda_engine(serialized)
+        if self._trt_engine is None:
+            raise RuntimeError(f"Failed to deserialize TensorRT engine {engine_path}")
+        self._trt_context = self._trt_engine.create_execution_context()
+
+    def _build_trt_engine(self, onnx_path: str, engine_path: str) -> bytes:
+        """Build an FP16 TensorRT engine from an ONNX export and cache it to disk"""
+        trt_logger = trt.Logger(trt.Logger.WARNING)
+        builder = trt.Builder(trt_logger)
+        network = builder.create_network(1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH))
+        parser = trt.OnnxParser(network, trt_logger)
+        
+        with open(onnx_path, 'rb') as f:
+            if not parser.parse(f.read()):
+                errors = [str(parser.get_error(i)) for i in range(parser.num_errors)]
+                raise RuntimeError(f"ONNX parse failed: {errors}")
+        
+        config = builder.create_builder_config()
+        config.set_flag(trt.BuilderFlag.FP16)
+        serialized = builder.build_serialized_network(network, config)
+        if serialized is None:
+            raise RuntimeError("TensorRT engine build failed")
+        
+        serialized = bytes(serialized)
+        with open(engine_path, 'wb') as f:
+            f.write(serialized)
+        logger.info(f"TensorRT engine cached at {engine_path}")
+        return serialized
+
+    def _forward(self, signal_tensor: torch.Tensor, feature_tensor: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """Run inference on the active backend (TensorRT or PyTorch)"""
+        if self._trt_context is not None:
+            signal_tensor = signal_tensor.float().contiguous()
+            feature_tensor = feature_tensor.float().contiguous()
+            main_logits = torch.empty(
+                signal_tensor.shape[0], PULSE_NUM_CLASSES, dtype=torch.float32, device=self.device
+            )
+            self._trt_context.set_tensor_address('signal', signal_tensor.data_ptr())
+            self._trt_context.set_tensor_address('features', feature_tensor.data_ptr())
+            self._trt_context.set_tensor_address('main', main_logits.data_ptr())
+            self._trt_context.execute_async_v3(torch.cuda.current_stream(self.device).cuda_stream)
+            return {'main': main_logits}
+        
+        if self._use_half:
+            signal_tensor = signal_tensor.half()
+            feature_tensor = feature_tensor.half()
+        with torch.no_grad():
+            return self.model(signal_tensor, feature_tensor)
 
     def analyze_pulse(self, signal_data: List[float], expected_bpm: float = None) -> Dict[str, Any]:
         """
@@ -55,7 +294,40 @@ class PulseService:
         """
         if self.model is None:
             self.load_model()
-            
+        
+        features, segment, feature_values = self._prepare_inputs(signal_data, expected_bpm)
+        
+        # Inference on the shared buffers; held until the forward is done since
+        # on CPU the device tensors alias them
+        with self._buf_lock:
+            self._sig_buf.zero_()
+            self._sig_buf[0, 0, :len(segment)].copy_(torch.from_numpy(segment))
+            self._feat_buf[0].copy_(torch.from_numpy(feature_values))
+            signal_tensor = self._sig_buf.to(self.device, non_blocking=True)
+            feature_tensor = self._feat_buf.to(self.device, non_blocking=True)
+            outputs = self._forward(signal_tensor, feature_tensor)
+            main_logits = outputs['main'].float().cpu()
+        
+        return self._build_result(main_logits, features)
+
+    async def analyze_pulse_async(self, signal_data: List[float], expected_bpm: float = None) -> Dict[str, Any]:
+        """
+        Async variant of analyze_pulse for request handlers.
+        
+        Preprocessing runs per request; the model forward is coalesced with
+        other requests arriving within PULSE_BATCH_WINDOW_S into one batch.
+        """
+        if self.model is None:
+            self.load_model()
+        
+        features, segment, feature_values = self._prepare_inputs(signal_data, expected_bpm)
+        signal_tensor, feature_tensor = self._to_tensors(segment, feature_values)
+        main_logits = await self._submit_to_batcher(signal_tensor, feature_tensor)
+        
+        return self._build_result(main_logits, features)
+
+    def _prepare_inputs(self, signal_data: List[float], expected_bpm: float = None):
+        """Filter the signal and extract features; returns the model window and feature values"""
         # Preprocess
         signal = np.array(signal_data, dtype=np.float32)
         filtered_signal = self._bandpass_filter(signal)
@@ -64,49 +336,96 @@ class PulseService:
         features = self._extract_features(filtered_signal, expected_bpm=expected_bpm)
         
         # Prepare for model
-        # Segment into windows if needed, but for single prediction we might take a fixed length
-        # For simplicity, let's take the first 10s (1250 samples) or pad/truncate
-        window_size = 1250
-        if len(filtered_signal) < window_size:
+        # For a single prediction take the first 10s (1250 samples); shorter signals are zero-padded later
+        segment = filtered_signal[:PULSE_WINDOW_SIZE]
+        feature_values = np.array([
+            features["heart_rate"], 
+            features["hrv"], 
+            features["lf_hf_ratio"]
+        ], dtype=np.float32)
+        
+        return features, segment, feature_values
+
+    def _to_tensors(self, segment: np.ndarray, feature_values: np.ndarray):
+        """Build per-request CPU model inputs (used where requests outlive the shared buffers)"""
+        window_size = PULSE_WINDOW_SIZE
+        if len(segment) < window_size:
             # Pad
             padded = np.zeros(window_size, dtype=np.float32)
-            padded[:len(filtered_signal)] = filtered_signal
+            padded[:len(segment)] = segment
             segment = padded
-        else:
-            segment = filtered_signal[:window_size]
             
-        # Model input
-        signal_tensor = torch.tensor(segment, dtype=torch.float32).unsqueeze(0).unsqueeze(0) # [1, 1, T]
-        feature_tensor = torch.tensor([
-            features["heart_rate"], 
-            features["hrv"], 
-            features["lf_hf_ratio"]
-        ], dtype=torch.float32).unsqueeze(0) # [1, 3]
+        # Model input; from_numpy shares the (contiguous float32) buffers instead of copying
+        signal_tensor = torch.from_numpy(segment)[None, None, :] # [1, 1, T]
+        feature_tensor = torch.from_numpy(feature_values)[None, :] # [1, 3]
         
-        signal_tensor = signal_tensor.to(self.device)
-        feature_tensor = feature_tensor.to(self.device)
+        return signal_tensor, feature_tensor
+
+    async def _submit_to_batcher(self, signal_tensor: torch.Tensor, feature_tensor: torch.Tensor) -> torch.Tensor:
+        """Queue one request for batched inference and wait for its logits row"""
+        loop = asyncio.get_running_loop()
+        if self._batch_loop is not loop or self._batch_task is None or self._batch_task.done():
+            self._batch_loop = loop
+            self._batch_queue = asyncio.Queue()
+            self._batch_task = loop.create_task(self._batch_worker(self._batch_queue))
         
-        # Inference
-        with torch.no_grad():
-            outputs = self.model(signal_tensor, feature_tensor)
+        future = loop.create_future()
+        await self._batch_queue.put((signal_tensor, feature_tensor, future))
+        return await future
+
+    def _forward_batch(self, signal_batch: torch.Tensor, feature_batch: torch.Tensor) -> torch.Tensor:
+        """Batched forward pass returning main logits on CPU (blocking)"""
+        # Same lock as analyze_pulse: the model and TensorRT context are not thread-safe
+        with self._buf_lock:
+            outputs = self._forward(signal_batch, feature_batch)
+            return outputs['main'].float().cpu()
+
+    async def _batch_worker(self, queue: asyncio.Queue):
+        """Drain queued requests into batches of up to PULSE_MAX_BATCH and run them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await queue.get()]
+            # The TensorRT engine is built for a fixed batch of 1
+            max_batch = 1 if self._trt_context is not None else PULSE_MAX_BATCH
+            deadline = loop.time() + PULSE_BATCH_WINDOW_S
+            while len(items) < max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
             
-        # Post-process
-        main_logits = outputs['main']
-        probs = torch.softmax(main_logits, dim=1).cpu().numpy()[0]
-        prediction = int(np.argmax(probs))
-        
-        dosha_map = {0: "Vata", 1: "Pitta", 2: "Kapha", 3: "Balanced"}
+            signal_batch = torch.cat([item[0] for item in items]).to(self.device)
+            feature_batch = torch.cat([item[1] for item in items]).to(self.device)
+            try:
+                main_logits = await asyncio.to_thread(self._forward_batch, signal_batch, feature_batch)
+            except Exception as e:
+                logger.error(f"Batched pulse inference failed: {e}")
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for i, (_, _, future) in enumerate(items):
+                if not future.done():
+                    future.set_result(main_logits[i:i + 1])
+
+    def _build_result(self, main_logits: torch.Tensor, features: Dict[str, Any]) -> Dict[str, Any]:
+        """Turn [1, num_classes] logits and extracted features into the analysis result"""
+        # Post-process: one device->host copy, then softmax in NumPy
+        logits = main_logits[0].detach().float().cpu().numpy()
+        exp_logits = np.exp(logits - logits.max())
+        probs = exp_logits / exp_logits.sum()
+        probs_list = probs.tolist()
+        prediction = int(probs.argmax())
         
         # Basic ML prediction
         ml_prediction = {
-            "prediction": dosha_map.get(prediction, "Unknown"),
-            "confidence": float(probs[prediction]),
-            "probabilities": {
-                "Vata": float(probs[0]),
-                "Pitta": float(probs[1]),
-                "Kapha": float(probs[2]),
-                "Balanced": float(probs[3])
-            },
+            "prediction": DOSHA_LABELS[prediction],
+            "confidence": probs_list[prediction],
+            "probabilities": dict(zip(DOSHA_LABELS, probs_list)),
             "features": features
         }
         
@@ -146,9 +465,7 @@ class PulseService:
         return combined_result
 
     def _bandpass_filter(self, signal: np.ndarray) -> np.ndarray:
-        nyq = 0.5 * self.sampling_rate
-        b, a = butter(3, [0.5 / nyq, 5.0 / nyq], btype="band")
-        return filtfilt(b, a, signal).astype(np.float32)
+        return sosfiltfilt(self._sos, signal).astype(np.float32, copy=False)
 
     def _extract_features(self, signal: np.ndarray, expected_bpm: float = None) -> Dict[str, float]:
         """Extract comprehensive features from pulse signal for Ayurvedic analysis.
@@ -157,8 +474,6 @@ class PulseService:
             signal: Filtered pulse signal
             expected_bpm: Expected BPM from user input (if available, use this instead of calculating)
         """
-        from scipy import stats
-        
         peaks, peak_properties = find_peaks(signal, distance=0.4 * self.sampling_rate, prominence=0.1)
         
         if len(peaks) < 2:
@@ -191,17 +506,18 @@ class PulseService:
         
         # Frequency domain analysis
         if len(rr_intervals) > 10:
-            rr_fft = np.abs(np.fft.rfft(rr_intervals - np.mean(rr_intervals)))
-            freqs = np.fft.rfftfreq(len(rr_intervals), d=np.mean(rr_intervals))
-            
-            # Very Low Frequency (VLF): 0.003-0.04 Hz - Kapha indicator
-            vlf = np.sum(rr_fft[(freqs >= 0.003) & (freqs < 0.04)])
+            # Zero-pad to a power of two (min 16) for the radix-2 FFT path
+            mean_rr = float(np.mean(rr_intervals))
+            n_fft = 1 << int(np.ceil(np.log2(max(len(rr_intervals), 16))))
+            rr_fft = np.abs(scipy.fft.rfft(rr_intervals - mean_rr, n=n_fft))
             
-            # Low Frequency (LF): 0.04-0.15 Hz - Sympathetic activity
-            lf = np.sum(rr_fft[(freqs >= 0.04) & (freqs < 0.15)])
+            # Band sums from one prefix sum over the spectrum; empty bands come out as 0
+            bins = _hrv_band_bins(n_fft, mean_rr)
+            cumulative = np.concatenate(([0.0], np.cumsum(rr_fft)))
+            band_power = cumulative[bins[1:]] - cumulative[bins[:-1]]
             
-            # High Frequency (HF): 0.15-0.4 Hz - Parasympathetic activity
-            hf = np.sum(rr_fft[(freqs >= 0.15) & (freqs < 0.4)])
+            # Very Low Frequency (VLF): Kapha indicator; LF: sympathetic; HF: parasympathetic activity
+            vlf, lf, hf = band_power
             
             lf_hf_ratio = float(lf / (hf + 1e-6))
             vlf_power = float(vlf)
@@ -284,25 +600,31 @@ class PulseService:
         if N < m + 1:
             return 0.0
         
-        # Normalize
-        data = np.array(data)
-        std = np.std(data)
+        # Tolerance relative to the spread of the series
+        std = data.std()
         if std == 0:
             return 0.0
         
         r = r * std
         
-        def _maxdist(xi, xj):
-            return max([abs(ua - va) for ua, va in zip(xi, xj)])
-        
-        def _phi(m):
-            patterns = np.array([data[i:i + m] for i in range(N - m)])
-            C = np.zeros(N - m)
-            for i in range(N - m):
-                for j in range(N - m):
-                    if i != j and _maxdist(patterns[i], patterns[j]) <= r:
-                        C[i] += 1
-            return np.sum(C) / (N - m)
+        if NUMBA_AVAILABLE:
+            B, A = _sampen_counts(np.ascontiguousarray(data, dtype=np.float64), m, r)
+            if A == 0 or B == 0:
+                return 0.0
+            # Same normalisation as _phi: ordered pairs / number of templates
+            phi_m = 2.0 * B / (N - m)
+            phi_m1 = 2.0 * A / (N - m - 1)
+            return float(-np.log(phi_m1 / phi_m))
+        
+        # Length-(m+1) templates as a strided view; their first m columns are the length-m templates
+        windows = np.lib.stride_tricks.sliding_window_view(data, m + 1)
+        
+        def _phi(k):
+            # Pairwise Chebyshev distances between all length-k templates
+            patterns = windows[:N - k, :k]
+            d = np.abs(patterns[:, None, :] - patterns[None, :, :]).max(axis=2)
+            np.fill_diagonal(d, np.inf)
+            return np.count_nonzero(d <= r) / (N - k)
         
         try:
             phi_m = _phi(m)
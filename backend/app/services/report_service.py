@@ -1,15 +1,39 @@
 # backend/app/services/report_service.py
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-import json
 import os
+import tempfile
+import threading
 from pathlib import Path
 
+import orjson
+
 from app.i18n import t
 
 logger = logging.getLogger(__name__)
 
+# Append-only listing index (one JSON object per line) kept in reports_dir
+REPORT_INDEX_FILENAME = "_index.jsonl"
+
+
+def _write_json(path: Path, obj: Dict[str, Any]) -> None:
+    """Write a report dict to disk as UTF-8 JSON (blocking; run off the event loop)"""
+    data = orjson.dumps(
+        obj,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    """Read a report dict from disk (blocking; run off the event loop)"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
 class ReportService:
     """
     Service for generating consultation reports and health summaries.
@@ -18,6 +42,8 @@ class ReportService:
     def __init__(self):
         self.reports_dir = Path("reports")
         self.reports_dir.mkdir(exist_ok=True)
+        self.index_path = self.reports_dir / REPORT_INDEX_FILENAME
+        self._index_lock = threading.Lock()
         logger.info("ReportService initialized")
     
     async def generate_consultation_report(self, consultation: Dict[str, Any]) -> Dict[str, Any]:
@@ -34,19 +60,25 @@ class ReportService:
             consultation_id = consultation["consultation_id"]
             locale = consultation.get("locale", "en")
             
+            # Extract the shared sub-dicts once for all section builders
+            diagnosis = consultation.get("final_diagnosis", {}) or {}
+            analyses = consultation.get("analyses", {}) or {}
+            recommendations = consultation.get("recommendations", {}) or {}
+            confidence = consultation.get("confidence_score")
+            
             # Generate report sections
             report = {
                 "report_id": f"RPT-{consultation_id}",
                 "consultation_id": consultation_id,
                 "generated_at": datetime.now().isoformat(),
                 "locale": locale,
-                "patient_summary": self._generate_patient_summary(consultation),
-                "analysis_summary": self._generate_analysis_summary(consultation),
-                "diagnosis_summary": self._generate_diagnosis_summary(consultation),
-                "recommendations": self._format_recommendations(consultation),
-                "health_score": self._calculate_health_score(consultation),
-                "risk_assessment": self._generate_risk_assessment(consultation),
-                "follow_up": self._generate_follow_up_plan(consultation),
+                "patient_summary": self._generate_patient_summary(consultation, analyses),
+                "analysis_summary": self._generate_analysis_summary(analyses),
+                "diagnosis_summary": self._generate_diagnosis_summary(diagnosis, confidence),
+                "recommendations": self._format_recommendations(recommendations),
+                "health_score": self._calculate_health_score(diagnosis, analyses, confidence),
+                "risk_assessment": self._generate_risk_assessment(diagnosis, analyses),
+                "follow_up": self._generate_follow_up_plan(diagnosis),
                 "disclaimer": t("report.disclaimer", locale=locale)
             }
             
@@ -61,7 +93,7 @@ class ReportService:
             logger.error(f"Failed to generate consultation report: {e}")
             raise
     
-    def _generate_patient_summary(self, consultation: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_patient_summary(self, consultation: Dict[str, Any], analyses: Dict[str, Any]) -> Dict[str, Any]:
         """Generate patient summary section"""
         patient_info = consultation.get("patient_info", {})
         
@@ -70,12 +102,11 @@ class ReportService:
             "gender": patient_info.get("gender", "Not specified"),
             "consultation_date": consultation.get("created_at", ""),
             "consultation_type": "Digital Ayurvedic Assessment",
-            "analyses_performed": list(consultation.get("analyses", {}).keys())
+            "analyses_performed": list(analyses.keys())
         }
     
-    def _generate_analysis_summary(self, consultation: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_analysis_summary(self, analyses: Dict[str, Any]) -> Dict[str, Any]:
         """Generate analysis summary section"""
-        analyses = consultation.get("analyses", {})
         summary = {}
         
         # Tongue analysis summary
@@ -109,10 +140,8 @@ class ReportService:
         
         return summary
     
-    def _generate_diagnosis_summary(self, consultation: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_diagnosis_summary(self, diagnosis: Dict[str, Any], confidence: Optional[float]) -> Dict[str, Any]:
         """Generate diagnosis summary section"""
-        diagnosis = consultation.get("final_diagnosis", {})
-        
         if not diagnosis:
             return {"status": "No diagnosis available"}
         
@@ -123,13 +152,11 @@ class ReportService:
             "current_state": diagnosis.get("vikriti_type", ""),
             "dosha_percentages": diagnosis.get("dosha_scores", {}),
             "explanation": diagnosis.get("explanation", ""),
-            "confidence_score": consultation.get("confidence_score", 0.0)
+            "confidence_score": 0.0 if confidence is None else confidence
         }
     
-    def _format_recommendations(self, consultation: Dict[str, Any]) -> Dict[str, Any]:
+    def _format_recommendations(self, recommendations: Dict[str, Any]) -> Dict[str, Any]:
         """Format recommendations for report"""
-        recommendations = consultation.get("recommendations", {})
-        
         if not recommendations:
             return {"status": "No recommendations available"}
         
@@ -177,11 +204,12 @@ class ReportService:
         
         return formatted
     
-    def _calculate_health_score(self, consultation: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_health_score(self, diagnosis: Dict[str, Any], analyses: Dict[str, Any],
+                                confidence: Optional[float]) -> Dict[str, Any]:
         """Calculate overall health score"""
         try:
-            diagnosis = consultation.get("final_diagnosis", {})
-            confidence = consultation.get("confidence_score", 0.5)
+            if confidence is None:
+                confidence = 0.5
             
             # Base score calculation
             imbalance_level = diagnosis.get("imbalance_level", "mild")
@@ -219,7 +247,7 @@ class ReportService:
                 "factors": {
                     "dosha_balance": imbalance_level,
                     "analysis_confidence": confidence,
-                    "symptoms_severity": self._get_symptom_severity(consultation)
+                    "symptoms_severity": self._get_symptom_severity(analyses)
                 }
             }
             
@@ -232,18 +260,14 @@ class ReportService:
                 "error": str(e)
             }
     
-    def _get_symptom_severity(self, consultation: Dict[str, Any]) -> str:
+    def _get_symptom_severity(self, analyses: Dict[str, Any]) -> str:
         """Get overall symptom severity"""
-        analyses = consultation.get("analyses", {})
         if "symptoms" in analyses:
             return analyses["symptoms"].get("overall_severity", "mild")
         return "none"
     
-    def _generate_risk_assessment(self, consultation: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_risk_assessment(self, diagnosis: Dict[str, Any], analyses: Dict[str, Any]) -> Dict[str, Any]:
         """Generate health risk assessment"""
-        diagnosis = consultation.get("final_diagnosis", {})
-        analyses = consultation.get("analyses", {})
-        
         risks = []
         
         # Risk based on dominant dosha imbalance
@@ -296,9 +320,8 @@ class ReportService:
         else:
             return "low"
     
-    def _generate_follow_up_plan(self, consultation: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_follow_up_plan(self, diagnosis: Dict[str, Any]) -> Dict[str, Any]:
         """Generate follow-up plan"""
-        diagnosis = consultation.get("final_diagnosis", {})
         imbalance_level = diagnosis.get("imbalance_level", "mild")
         
         # Follow-up timeline based on imbalance level
@@ -335,8 +358,8 @@ class ReportService:
             
             report_path = self.reports_dir / filename
             
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(_write_json, report_path, report)
+            await asyncio.to_thread(self._append_index, self._index_entry(report, report_path))
             
             logger.info(f"Report saved to {report_path}")
             return report_path
@@ -348,45 +371,113 @@ class ReportService:
     async def get_report(self, report_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a saved report"""
         try:
-            # Find report file
-            for report_file in self.reports_dir.glob(f"{report_id}_*.json"):
-                with open(report_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            
-            return None
+            return await asyncio.to_thread(self._get_report_sync, report_id)
             
         except Exception as e:
             logger.error(f"Failed to retrieve report {report_id}: {e}")
             return None
     
+    def _get_report_sync(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """Find and load a saved report (blocking)"""
+        # Find report file
+        for report_file in self.reports_dir.glob(f"{report_id}_*.json"):
+            return _read_json(report_file)
+        
+        return None
+    
     async def list_reports(self, limit: int = 50) -> List[Dict[str, Any]]:
         """List recent reports"""
         try:
-            reports = []
-            
-            for report_file in sorted(self.reports_dir.glob("RPT-*.json"), 
-                                    key=os.path.getmtime, reverse=True)[:limit]:
-                try:
-                    with open(report_file, 'r', encoding='utf-8') as f:
-                        report_data = json.load(f)
-                        
-                    reports.append({
-                        "report_id": report_data.get("report_id"),
-                        "consultation_id": report_data.get("consultation_id"),
-                        "generated_at": report_data.get("generated_at"),
-                        "patient_age": report_data.get("patient_summary", {}).get("age"),
-                        "health_score": report_data.get("health_score", {}).get("score"),
-                        "file_path": str(report_file)
-                    })
-                except Exception as e:
-                    logger.warning(f"Failed to read report file {report_file}: {e}")
-                    continue
-            
-            return reports
+            return await asyncio.to_thread(self._list_reports_sync, limit)
             
         except Exception as e:
             logger.error(f"Failed to list reports: {e}")
             return []
+    
+    def _list_reports_sync(self, limit: int) -> List[Dict[str, Any]]:
+        """Read the most recent entries from the report index (blocking)"""
+        with self._index_lock:
+            if not self.index_path.exists():
+                self._rebuild_index()
+        
+        with open(self.index_path, 'rb') as f:
+            lines = f.read().splitlines()
+        
+        reports = []
+        seen = set()
+        stale = False
+        for line in reversed(lines):
+            if len(reports) >= limit:
+                break
+            if not line.strip():
+                continue
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"Skipping corrupt report index entry: {e}")
+                continue
+            # A report saved while the index was being rebuilt can be listed twice
+            file_path = entry.get("file_path")
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+            if not os.path.exists(file_path):
+                stale = True
+                continue
+            reports.append(entry)
+        
+        if stale:
+            # Report files were deleted since indexing; rebuild to prune them
+            with self._index_lock:
+                self._rebuild_index()
+        
+        return reports
+    
+    @staticmethod
+    def _index_entry(report_data: Dict[str, Any], report_path: Path) -> Dict[str, Any]:
+        """Build the listing fields stored in the index for one report"""
+        return {
+            "report_id": report_data.get("report_id"),
+            "consultation_id": report_data.get("consultation_id"),
+            "generated_at": report_data.get("generated_at"),
+            "patient_age": report_data.get("patient_summary", {}).get("age"),
+            "health_score": report_data.get("health_score", {}).get("score"),
+            "file_path": str(report_path)
+        }
+    
+    def _append_index(self, entry: Dict[str, Any]) -> None:
+        """Append one report entry to the index (blocking)"""
+        line = orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+        with self._index_lock:
+            if not self.index_path.exists():
+                # Index missing: rebuild from disk, which already includes this report
+                self._rebuild_index()
+                return
+            with open(self.index_path, 'ab') as f:
+                f.write(line)
+    
+    def _rebuild_index(self) -> None:
+        """Recreate the index by scanning saved report files (blocking; caller holds _index_lock)"""
+        logger.info("Rebuilding report index")
+        lines = []
+        for report_file in sorted(self.reports_dir.glob("RPT-*.json"), key=os.path.getmtime):
+            try:
+                entry = self._index_entry(_read_json(report_file), report_file)
+                lines.append(orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
+            except Exception as e:
+                logger.warning(f"Failed to read report file {report_file}: {e}")
+                continue
+        
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.index_path.parent, prefix=self.index_path.name, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b"".join(lines))
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
 # Global instance
 report_service = ReportService()
\ No newline at end of file
@@ -3,12 +3,25 @@ User Service
 """
 
 from typing import Optional, List
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.schemas.user import UserUpdate
 
 
+# Hot lookups built once so every call reuses the same cached compiled statement
+_GET_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_GET_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+_LIST_AFTER_ID = (
+    select(User)
+    .where(User.id > bindparam("after_id"))
+    .order_by(User.id)
+    .limit(bindparam("limit"))
+)
+
+
 class UserService:
     """User management service"""
     
@@ -25,7 +38,7 @@ class UserService:
         Returns:
             User or None
         """
-        return self.db.query(User).filter(User.id == user_id).first()
+        return self.db.get(User, user_id)
     
     def get_user_by_email(self, email: str) -> Optional[User]:
         """
@@ -37,7 +50,7 @@ class UserService:
         Returns:
             User or None
         """
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.execute(_GET_BY_EMAIL, {"email": email}).scalars().first()
     
     def get_user_by_username(self, username: str) -> Optional[User]:
         """
@@ -49,7 +62,7 @@ class UserService:
         Returns:
             User or None
         """
-        return self.db.query(User).filter(User.username == username).first()
+        return self.db.execute(_GET_BY_USERNAME, {"username": username}).scalars().first()
     
     def update_user_profile(self, user: User, update_data: UserUpdate) -> User:
         """
@@ -65,11 +78,25 @@ class UserService:
         # Update only provided fields
         update_dict = update_data.model_dump(exclude_unset=True)
         
-        for field, value in update_dict.items():
-            setattr(user, field, value)
+        if not update_dict:
+            return user
         
-        self.db.commit()
-        self.db.refresh(user)
+        # Single UPDATE ... RETURNING; the written values (and the server-side
+        # updated_at) are recorded as loaded state on a commit that doesn't
+        # expire the user, so serializing it issues no reload SELECT
+        fields = list(dict.fromkeys([*update_dict, "updated_at"]))
+        stmt = (
+            update(User)
+            .where(User.id == user.id)
+            .values(**update_dict)
+            .returning(*(getattr(User, field) for field in fields))
+            .execution_options(synchronize_session=False)
+        )
+        row = self.db.execute(stmt).one()
+        self._commit_keeping_state()
+        
+        for field, value in zip(fields, row):
+            set_committed_value(user, field, value)
         
         return user
     
@@ -83,11 +110,7 @@ class UserService:
         Returns:
             Deactivated user
         """
-        user.is_active = False
-        self.db.commit()
-        self.db.refresh(user)
-        
-        return user
+        return self._set_active(user, False)
     
     def activate_user(self, user: User) -> User:
         """
@@ -99,12 +122,49 @@ class UserService:
         Returns:
             Activated user
         """
-        user.is_active = True
-        self.db.commit()
-        self.db.refresh(user)
+        return self._set_active(user, True)
+    
+    def _set_active(self, user: User, is_active: bool) -> User:
+        """
+        Toggle the active flag with a single UPDATE ... RETURNING
+        
+        Args:
+            user: User to update
+            is_active: New active state
+            
+        Returns:
+            Updated user
+        """
+        stmt = (
+            update(User)
+            .where(User.id == user.id)
+            .values(is_active=is_active)
+            .returning(User.is_active, User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        new_state, updated_at = self.db.execute(stmt).one()
+        self._commit_keeping_state()
+        
+        # Record the returned values as loaded state; the commit left the rest unexpired
+        set_committed_value(user, "is_active", new_state)
+        set_committed_value(user, "updated_at", updated_at)
         
         return user
     
+    def _commit_keeping_state(self) -> None:
+        """
+        Commit without expiring loaded instances
+        
+        Used after UPDATE ... RETURNING, where the caller records the returned
+        values itself; the session's expire_on_commit setting is restored.
+        """
+        expire_on_commit = self.db.expire_on_commit
+        self.db.expire_on_commit = False
+        try:
+            self.db.commit()
+        finally:
+            self.db.expire_on_commit = expire_on_commit
+    
     def delete_user(self, user: User) -> None:
         """
         Delete user account (hard delete)
@@ -115,15 +175,18 @@ class UserService:
         self.db.delete(user)
         self.db.commit()
     
-    def get_all_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    def get_all_users(self, after_id: int = 0, limit: int = 100) -> List[User]:
         """
-        Get all users (admin only)
+        Get all users (admin only), keyset-paginated by ID
         
         Args:
-            skip: Number of records to skip
+            after_id: Cursor; return users with ID greater than this
+                (pass the last ID of the previous page)
             limit: Maximum number of records to return
             
         Returns:
-            List of users
+            List of users ordered by ID
         """
-        return self.db.query(User).offset(skip).limit(limit).all()
+        return list(
+            self.db.execute(_LIST_AFTER_ID, {"after_id": after_id, "limit": limit}).scalars()
+        )
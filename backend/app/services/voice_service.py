@@ -1,17 +1,115 @@
 
 # backend/app/services/voice_service.py
 import logging
-from typing import Dict, Any, Optional, List
+import asyncio
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator, Iterator
 import os
 import tempfile
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict
+from contextlib import suppress
 from pathlib import Path
 import json
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
 # Import the new analyzer
 from app.ai_models.voice_analysis import voice_analyzer
 
 logger = logging.getLogger(__name__)
 
+# Transcripts of recently seen audio, keyed by content hash
+TRANSCRIPT_CACHE_SIZE = 256
+TRANSCRIPT_CACHE_TTL_S = 3600
+
+
+def _audio_digest(audio_file_path: str) -> str:
+    """Content hash of an audio file (streamed, not loaded whole)"""
+    with open(audio_file_path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+# Generated speech, keyed by (language, voice_type, text); least recently used files are evicted
+TTS_CACHE_DIR = Path("cache") / "tts"
+TTS_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+
+def _tts_cache_path(text: str, language: str, voice_type: str) -> Path:
+    key = hashlib.blake2b(f"{language}|{voice_type}|{text}".encode("utf-8"), digest_size=16).hexdigest()
+    return TTS_CACHE_DIR / f"{key}.mp3"
+
+
+def _write_tts_cache(cache_path: Path, audio_bytes: bytes) -> None:
+    """Atomically publish generated audio to the cache, then enforce the size cap"""
+    fd, part_path = tempfile.mkstemp(dir=TTS_CACHE_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as part:
+            part.write(audio_bytes)
+        os.replace(part_path, cache_path)
+    finally:
+        with suppress(FileNotFoundError):
+            os.unlink(part_path)
+    _evict_tts_cache()
+
+
+def _evict_tts_cache() -> None:
+    """Delete least recently used MP3s until the cache is under TTS_CACHE_MAX_BYTES"""
+    entries = []
+    total = 0
+    with os.scandir(TTS_CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".mp3"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+    if total <= TTS_CACHE_MAX_BYTES:
+        return
+    # The newest file (usually the one just written) is always kept
+    for _, size, path in sorted(entries)[:-1]:
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+        total -= size
+        if total <= TTS_CACHE_MAX_BYTES:
+            break
+
+
+# Basic keyword extraction for symptoms (can be improved with NLP)
+SYMPTOM_KEYWORDS = {
+    "en": ["pain", "headache", "fever", "cough", "tired", "stress", "anxiety", "stomach", "sleep", "insomnia"],
+    "hi": ["दर्द", "सिरदर्द", "बुखार", "खांसी", "थकान", "तनाव", "चिंता", "पेट", "नींद"]
+}
+
+
+# Pre-lowered (keyword, lowered) pairs for the substring fallback
+_SYMPTOM_KEYWORDS_LOWER = {
+    lang: tuple((keyword, keyword.lower()) for keyword in keywords)
+    for lang, keywords in SYMPTOM_KEYWORDS.items()
+}
+
+
+def _build_keyword_automata() -> Dict[str, Any]:
+    """One Aho-Corasick automaton per language; values are (keyword index, keyword)"""
+    automata = {}
+    for lang, keywords in SYMPTOM_KEYWORDS.items():
+        automaton = ahocorasick.Automaton()
+        for index, keyword in enumerate(keywords):
+            automaton.add_word(keyword.lower(), (index, keyword))
+        automaton.make_automaton()
+        automata[lang] = automaton
+    return automata
+
+
+_KEYWORD_AUTOMATA = _build_keyword_automata() if AHOCORASICK_AVAILABLE else {}
+
+
 class VoiceService:
     """
     Advanced Voice Service for Speech-to-Text and Dosha Analysis.
@@ -20,21 +118,24 @@ class VoiceService:
     
     def __init__(self):
         self.analyzer = voice_analyzer
-        self.supported_languages = [
+        self.supported_languages = (
             "en", "hi", "ta", "te", "kn", "ml", "gu", "mr", "bn", "pa", "or"
-        ]
+        )
+        self._transcript_cache: OrderedDict = OrderedDict()
+        self._transcript_lock = threading.Lock()
+        TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
         logger.info("VoiceService initialized with AI analysis capabilities")
     
     async def speech_to_text(self, audio_file_path: str, language: str = "en") -> Dict[str, Any]:
         """Convert speech to text using Google Speech Recognition"""
         try:
-            if not os.path.exists(audio_file_path):
+            # Hashing and the Google call are blocking; keep them off the event loop.
+            # Hashing opens the file first, so a missing file surfaces here.
+            try:
+                text = await asyncio.to_thread(self._transcribe_cached, audio_file_path)
+            except FileNotFoundError:
                 return {"success": False, "error": "Audio file not found", "text": ""}
             
-            # Use analyzer's transcribe method (synchronous, run in thread if needed)
-            # For simplicity in this demo, running direct
-            text = self.analyzer._transcribe(audio_file_path)
-            
             if not text:
                  return {"success": False, "error": "Transcription returned empty", "text": ""}
 
@@ -50,6 +151,27 @@ class VoiceService:
             logger.error(f"Speech-to-text error: {e}")
             return {"success": False, "error": str(e), "text": ""}
     
+    def _transcribe_cached(self, audio_file_path: str) -> str:
+        """Transcribe audio, reusing the result for byte-identical uploads"""
+        key = _audio_digest(audio_file_path)
+        now = time.monotonic()
+        with self._transcript_lock:
+            cached = self._transcript_cache.get(key)
+            if cached is not None and now - cached[0] < TRANSCRIPT_CACHE_TTL_S:
+                self._transcript_cache.move_to_end(key)
+                return cached[1]
+        
+        text = self.analyzer._transcribe(audio_file_path)
+        
+        # Only successful transcriptions are cached so failures get retried
+        if text:
+            with self._transcript_lock:
+                self._transcript_cache[key] = (now, text)
+                self._transcript_cache.move_to_end(key)
+                if len(self._transcript_cache) > TRANSCRIPT_CACHE_SIZE:
+                    self._transcript_cache.popitem(last=False)
+        return text
+    
     async def process_voice_consultation(self, audio_file_path: str, language: str = "en") -> Dict[str, Any]:
         """
         Process voice input for consultation:
@@ -58,7 +180,7 @@ class VoiceService:
         """
         try:
             # Run complete analysis
-            analysis_result = self.analyzer.analyze(audio_file_path)
+            analysis_result = await asyncio.to_thread(self.analyzer.analyze, audio_file_path)
             
             if not analysis_result["success"]:
                  return {"success": False, "error": analysis_result.get("error")}
@@ -94,24 +216,27 @@ class VoiceService:
         Parse consultation information from transcribed text
         """
         try:
-            # Basic keyword extraction for symptoms (can be improved with NLP)
-            symptom_keywords = {
-                "en": ["pain", "headache", "fever", "cough", "tired", "stress", "anxiety", "stomach", "sleep", "insomnia"],
-                "hi": ["दर्द", "सिरदर्द", "बुखार", "खांसी", "थकान", "तनाव", "चिंता", "पेट", "नींद"]
-            }
-            
-            keywords = symptom_keywords.get(language, symptom_keywords["en"])
+            language_key = language if language in SYMPTOM_KEYWORDS else "en"
             found_symptoms = []
             text_lower = text.lower()
             
-            for keyword in keywords:
-                if keyword.lower() in text_lower:
-                    found_symptoms.append({
-                        "name": keyword,
-                        "severity": "moderate",
-                        "duration": "",
-                        "description": f"Mentioned in voice consultation"
-                    })
+            if AHOCORASICK_AVAILABLE:
+                # Single pass over the text; hits reported in keyword order like the loop below
+                hits = {value for _, value in _KEYWORD_AUTOMATA[language_key].iter(text_lower)}
+                matched = [keyword for _, keyword in sorted(hits)]
+            else:
+                matched = [
+                    keyword for keyword, keyword_lower in _SYMPTOM_KEYWORDS_LOWER[language_key]
+                    if keyword_lower in text_lower
+                ]
+            
+            for keyword in matched:
+                found_symptoms.append({
+                    "name": keyword,
+                    "severity": "moderate",
+                    "duration": "",
+                    "description": f"Mentioned in voice consultation"
+                })
             
             patient_info = {
                 "age": 30,
@@ -134,35 +259,49 @@ class VoiceService:
                 "error": str(e)
             }
     
-    async def text_to_speech(self, text: str, language: str = "en", voice_type: str = "female") -> Dict[str, Any]:
+    async def text_to_speech(self, text: str, language: str = "en", voice_type: str = "female",
+                             return_bytes: bool = False) -> Dict[str, Any]:
         """
         Text-to-Speech using gTTS (Google Text-to-Speech)
         
+        Audio is cached on disk per (text, language, voice_type); the returned
+        path is owned by the cache and must not be deleted by the caller.
+        With return_bytes=True the MP3 is returned in memory as "audio_bytes"
+        instead of a path.
+        
         Note: This is a basic implementation. For production, consider:
         - Google Cloud TTS for better quality
-        - Caching audio files
-        - Streaming audio
         """
         try:
-            from gtts import gTTS
-            import tempfile
-            import os
-            
-            # Create temporary file for audio
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_path = temp_file.name
+            cache_path = self.cached_tts_path(text, language, voice_type)
+            cached = cache_path is not None
+            audio_bytes = None
             
-            # Generate speech
-            tts = gTTS(text=text, lang=language, slow=False)
-            tts.save(temp_path)
+            if cached:
+                if return_bytes:
+                    audio_bytes = await asyncio.to_thread(cache_path.read_bytes)
+            else:
+                from gtts import gTTS
+                
+                # Synthesize in memory, then publish to the cache
+                tts = gTTS(text=text, lang=language, slow=False)
+                buffer = io.BytesIO()
+                await asyncio.to_thread(tts.write_to_fp, buffer)
+                audio_bytes = buffer.getvalue()
+                cache_path = _tts_cache_path(text, language, voice_type)
+                await asyncio.to_thread(_write_tts_cache, cache_path, audio_bytes)
             
-            return {
+            result = {
                 "success": True,
-                "audio_path": temp_path,
                 "method": "gtts",
                 "language": language,
-                "note": "Audio file generated. Remember to delete after use."
+                "cached": cached
             }
+            if return_bytes:
+                result["audio_bytes"] = audio_bytes
+            else:
+                result["audio_path"] = str(cache_path)
+            return result
             
         except ImportError:
             logger.warning("gTTS not installed. Install with: pip install gtts")
@@ -178,8 +317,54 @@ class VoiceService:
                 "error": str(e)
             }
 
-    def get_supported_languages(self) -> List[str]:
-        return self.supported_languages.copy()
+    def cached_tts_path(self, text: str, language: str = "en", voice_type: str = "female") -> Optional[Path]:
+        """Path of previously generated speech for these inputs, or None (marks the entry as recently used)"""
+        cache_path = _tts_cache_path(text, language, voice_type)
+        try:
+            os.utime(cache_path)
+        except FileNotFoundError:
+            return None
+        return cache_path
+
+    def text_to_speech_stream(self, text: str, language: str = "en", voice_type: str = "female") -> AsyncIterator[bytes]:
+        """
+        Stream gTTS MP3 fragments as they are synthesized, without a temp file.
+        
+        gTTS is set up eagerly so ImportError/ValueError (bad language) surface
+        before a response is started; fetching happens during iteration. A fully
+        streamed result is also written to the TTS cache.
+        """
+        from gtts import gTTS
+        
+        tts = gTTS(text=text, lang=language, slow=False)
+        return self._stream_to_cache(tts.stream(), _tts_cache_path(text, language, voice_type))
+    
+    @staticmethod
+    async def _stream_to_cache(chunks: Iterator[bytes], cache_path: Path) -> AsyncIterator[bytes]:
+        """Yield chunks while teeing them to a temp file that is published to cache_path on completion"""
+        fd, part_path = tempfile.mkstemp(dir=TTS_CACHE_DIR, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as part:
+                def next_chunk():
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        part.write(chunk)
+                    return chunk
+                
+                while True:
+                    chunk = await asyncio.to_thread(next_chunk)
+                    if chunk is None:
+                        break
+                    yield chunk
+            os.replace(part_path, cache_path)
+            await asyncio.to_thread(_evict_tts_cache)
+        finally:
+            # Left behind only if the stream failed or the client went away
+            with suppress(FileNotFoundError):
+                os.unlink(part_path)
+    
+    def get_supported_languages(self) -> Tuple[str, ...]:
+        return self.supported_languages
     
     async def health_check(self) -> Dict[str, Any]:
         return {"service": "voice_service", "status": "healthy", "backend": "librosa + speech_recognition"}
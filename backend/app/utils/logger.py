@@ -1,34 +1,73 @@
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
+_listener = None
+_queue_handler = None
+
 def setup_logging():
     """
     Configure application-wide logging
+
+    Request threads only enqueue records; a background QueueListener does the
+    stdout and rotating-file writes.
     """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
     log_format = (
         "%(asctime)s | %(levelname)s | %(name)s | "
         "%(filename)s:%(lineno)d | %(message)s"
     )
+    formatter = logging.Formatter(log_format)
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            RotatingFileHandler(
-                LOG_DIR / "app.log",
-                maxBytes=5 * 1024 * 1024,
-                backupCount=3,
-                encoding="utf-8",
-            ),
-        ],
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler = RotatingFileHandler(
+        LOG_DIR / "app.log",
+        maxBytes=5 * 1024 * 1024,
+        backupCount=3,
+        encoding="utf-8",
     )
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    _queue_handler = QueueHandler(log_queue)
+    root.addHandler(_queue_handler)
+
+    _listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
 
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("uvicorn.error").setLevel(logging.INFO)
     logging.getLogger("uvicorn.access").setLevel(logging.INFO)
+
+
+def shutdown_logging():
+    """
+    Flush queued records and stop the listener thread
+
+    The real handlers are attached to the root logger directly afterwards, so
+    records logged later in shutdown are still written.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        root.addHandler(handler)
+    _listener = None
+    _queue_handler = None
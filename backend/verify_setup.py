@@ -5,6 +5,7 @@ Checks if all required packages are installed
 """
 
 import sys
+from importlib.util import find_spec
 
 print("=" * 60)
 print("Voice Assistant Setup Verification")
@@ -30,12 +31,18 @@ installed_packages = []
 print("\nChecking required packages:")
 print("-" * 60)
 
-for module_name, package_name in required_packages.items():
+def is_installed(module_name):
+    """Locate a module without executing it (dotted names import only their parent packages)"""
     try:
-        __import__(module_name)
+        return find_spec(module_name) is not None
+    except ModuleNotFoundError:
+        return False
+
+for module_name, package_name in required_packages.items():
+    if is_installed(module_name):
         print(f"✅ {package_name}")
         installed_packages.append(package_name)
-    except ImportError:
+    else:
         print(f"❌ {package_name} - NOT INSTALLED")
         missing_packages.append(package_name)
 
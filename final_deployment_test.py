@@ -5,13 +5,31 @@ Complete end-to-end testing before deployment
 
 import requests
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 BASE_URL = "http://localhost:8000/api/v1"
 HEALTH_URL = "http://localhost:8000"
 FRONTEND_URL = "http://localhost:5173"
 
+# Shared keep-alive connection pool for all probes
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+# Per-thread output buffer so concurrently run tests print as contiguous blocks
+_output = threading.local()
+
 class Colors:
     GREEN = '\033[92m'
     RED = '\033[91m'
@@ -19,29 +37,55 @@ class Colors:
     BLUE = '\033[94m'
     END = '\033[0m'
 
+def emit(line):
+    buffer = getattr(_output, 'lines', None)
+    if buffer is None:
+        print(line)
+    else:
+        buffer.append(line)
+
 def print_header(text):
-    print(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
-    print(f"{Colors.BLUE}{text.center(70)}{Colors.END}")
-    print(f"{Colors.BLUE}{'='*70}{Colors.END}\n")
+    emit(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
+    emit(f"{Colors.BLUE}{text.center(70)}{Colors.END}")
+    emit(f"{Colors.BLUE}{'='*70}{Colors.END}\n")
 
 def print_success(text):
-    print(f"{Colors.GREEN}[PASS]{Colors.END} {text}")
+    emit(f"{Colors.GREEN}[PASS]{Colors.END} {text}")
 
 def print_error(text):
-    print(f"{Colors.RED}[FAIL]{Colors.END} {text}")
+    emit(f"{Colors.RED}[FAIL]{Colors.END} {text}")
 
 def print_info(text):
-    print(f"{Colors.YELLOW}[INFO]{Colors.END} {text}")
+    emit(f"{Colors.YELLOW}[INFO]{Colors.END} {text}")
+
+def dumps_json(obj):
+    """JSON text for form fields; orjson's C encoder handles the large pulse arrays"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+def parse_json(response):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+def run_buffered(test_func):
+    """Run a test in a worker thread, collecting its output instead of printing it"""
+    _output.lines = []
+    try:
+        return test_func(), _output.lines
+    finally:
+        _output.lines = None
 
 def test_backend_health():
     """Test 1: Backend Health Check"""
     print_header("TEST 1: Backend Health Check")
     
     try:
-        response = requests.get(f"{HEALTH_URL}/health", timeout=5)
+        response = SESSION.get(f"{HEALTH_URL}/health", timeout=5)
         if response.status_code == 200:
             print_success("Backend is running")
-            print_info(f"Response: {response.json()}")
+            print_info(f"Response: {parse_json(response)}")
             return True
         else:
             print_error(f"Backend returned status {response.status_code}")
@@ -59,7 +103,7 @@ def test_frontend_running():
     print_header("TEST 2: Frontend Running")
     
     try:
-        response = requests.get(FRONTEND_URL, timeout=5)
+        response = SESSION.get(FRONTEND_URL, timeout=5)
         if response.status_code == 200:
             print_success("Frontend is running")
             return True
@@ -79,7 +123,7 @@ def test_pulse_generation():
     print_header("TEST 3: Pulse Generation")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/pulse/generate-synthetic-pulse",
             data={
                 "heart_rate": 75,
@@ -90,7 +134,7 @@ def test_pulse_generation():
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             if 'pulse_data' in data and len(data['pulse_data']) > 0:
                 print_success(f"Pulse generated: {len(data['pulse_data'])} points")
                 return True, data['pulse_data']
@@ -115,25 +159,25 @@ def test_complete_consultation(pulse_data):
             "patient_name": "Test Patient",
             "patient_age": 30,
             "patient_gender": "male",
-            "symptoms": json.dumps([
+            "symptoms": dumps_json([
                 "fatigue",
                 "headache",
                 "digestive_issues"
             ]),
-            "pulse_data": json.dumps(pulse_data) if pulse_data else json.dumps([]),
+            "pulse_data": dumps_json(pulse_data or []),
             "heart_rate": 75,
             "locale": "en"
         }
         
         print_info("Submitting consultation...")
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/consultations/complete",
             data=consultation_data,
             timeout=30
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = parse_json(response)
             
             # Check response structure
             if 'analysis' in result:
@@ -173,10 +217,10 @@ def test_voice_languages():
     print_header("TEST 5: Voice Assistant Languages")
     
     try:
-        response = requests.get(f"{BASE_URL}/voice/supported-languages", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/voice/supported-languages", timeout=5)
         
         if response.status_code == 200:
-            languages = response.json()
+            languages = parse_json(response)
             if 'supported_languages' in languages:
                 print_success(f"Supported languages: {len(languages['supported_languages'])}")
                 for lang in languages['supported_languages'][:5]:  # Show first 5
@@ -198,7 +242,7 @@ def test_tongue_analysis():
     
     try:
         # Just check if endpoint is available (without actual image)
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/tongue/analyze",
             files={'image': ('test.jpg', b'fake_image_data', 'image/jpeg')},
             timeout=10
@@ -220,7 +264,7 @@ def test_symptom_extraction():
     print_header("TEST 7: Symptom Extraction from Text")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/voice/extract-symptoms-from-text",
             data={
                 "text": "I have a headache and feel tired",
@@ -230,7 +274,7 @@ def test_symptom_extraction():
         )
         
         if response.status_code == 200:
-            result = response.json()
+            result = parse_json(response)
             if 'extracted_symptoms' in result:
                 print_success(f"Extracted {len(result['extracted_symptoms'])} symptoms")
                 for symptom in result['extracted_symptoms']:
@@ -252,7 +296,7 @@ def test_database_connection():
     
     try:
         # Try to access an endpoint that requires database
-        response = requests.get(f"{HEALTH_URL}/health", timeout=5)
+        response = SESSION.get(f"{HEALTH_URL}/health", timeout=5)
         
         if response.status_code == 200:
             print_success("Database connection working")
@@ -269,7 +313,7 @@ def test_cors_headers():
     print_header("TEST 9: CORS Configuration")
     
     try:
-        response = requests.options(
+        response = SESSION.options(
             f"{HEALTH_URL}/health",
             headers={'Origin': FRONTEND_URL},
             timeout=5
@@ -293,40 +337,34 @@ def run_all_tests():
     print(f"{Colors.BLUE}Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Colors.END}")
     print(f"{Colors.BLUE}{'='*70}{Colors.END}")
     
-    results = []
-    
-    # Test 1: Backend Health
-    results.append(("Backend Health", test_backend_health()))
-    
-    # Test 2: Frontend Running
-    results.append(("Frontend Running", test_frontend_running()))
-    
-    # Test 3: Pulse Generation
-    pulse_success, pulse_data = test_pulse_generation()
-    results.append(("Pulse Generation", pulse_success))
-    
-    # Test 4: Complete Consultation
-    if pulse_success:
-        consult_success, _ = test_complete_consultation(pulse_data)
-        results.append(("Complete Consultation", consult_success))
-    else:
-        results.append(("Complete Consultation", False))
-        print_error("Skipped: Pulse generation failed")
-    
-    # Test 5: Voice Languages
-    results.append(("Voice Languages", test_voice_languages()))
-    
-    # Test 6: Tongue Analysis
-    results.append(("Tongue Analysis", test_tongue_analysis()))
-    
-    # Test 7: Symptom Extraction
-    results.append(("Symptom Extraction", test_symptom_extraction()))
+    # Pulse generation feeds the consultation test, so those two run back to back
+    def test_pulse_and_consultation():
+        pulse_success, pulse_data = test_pulse_generation()
+        if pulse_success:
+            consult_success, _ = test_complete_consultation(pulse_data)
+        else:
+            consult_success = False
+            print_error("Skipped: Pulse generation failed")
+        return [("Pulse Generation", pulse_success), ("Complete Consultation", consult_success)]
     
-    # Test 8: Database Connection
-    results.append(("Database Connection", test_database_connection()))
+    # Independent probes run concurrently; results are reported in test order
+    groups = [
+        lambda: [("Backend Health", test_backend_health())],
+        lambda: [("Frontend Running", test_frontend_running())],
+        test_pulse_and_consultation,
+        lambda: [("Voice Languages", test_voice_languages())],
+        lambda: [("Tongue Analysis", test_tongue_analysis())],
+        lambda: [("Symptom Extraction", test_symptom_extraction())],
+        lambda: [("Database Connection", test_database_connection())],
+        lambda: [("CORS Configuration", test_cors_headers())],
+    ]
     
-    # Test 9: CORS Headers
-    results.append(("CORS Configuration", test_cors_headers()))
+    results = []
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        for group_results, lines in executor.map(run_buffered, groups):
+            for line in lines:
+                print(line)
+            results.extend(group_results)
     
     # Generate Report
     print_header("TEST SUMMARY")
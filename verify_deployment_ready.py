@@ -2,9 +2,19 @@
 Verify all files are ready for Railway deployment
 """
 
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
 class Colors:
     GREEN = '\033[92m'
     RED = '\033[91m'
@@ -12,56 +22,88 @@ class Colors:
     BLUE = '\033[94m'
     END = '\033[0m'
 
-def check_file(filepath, description):
-    """Check if a file exists"""
-    exists = os.path.exists(filepath)
-    status = f"{Colors.GREEN}✓{Colors.END}" if exists else f"{Colors.RED}✗{Colors.END}"
-    print(f"{status} {filepath:<50} {description}")
-    return exists
+@lru_cache(maxsize=None)
+def dir_index(parent):
+    """Map each entry name in a directory to whether it is a directory, from one scandir"""
+    try:
+        with os.scandir(parent or ".") as entries:
+            return {entry.name: entry.is_dir() for entry in entries}
+    except OSError:
+        return {}
+
+@lru_cache(maxsize=None)
+def _parse_json(filepath, mtime_ns):
+    data = Path(filepath).read_bytes()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_json(filepath):
+    """Parse a JSON file once per modification time"""
+    return _parse_json(filepath, os.stat(filepath).st_mtime_ns)
+
+# (section, [(path, description, is_directory)]) in report order
+CHECKS = [
+    ("Backend Files", [
+        ("backend/app/main.py", "FastAPI application", False),
+        ("backend/requirements.txt", "Python dependencies", False),
+        ("backend/Procfile", "Railway start command", False),
+        ("backend/runtime.txt", "Python version", False),
+        ("backend/.env", "Environment variables", False),
+        ("backend/alembic.ini", "Database migrations", False),
+    ]),
+    ("Frontend Files", [
+        ("frontend/package.json", "Node dependencies", False),
+        ("frontend/vite.config.js", "Vite configuration", False),
+        ("frontend/index.html", "HTML template", False),
+        ("frontend/src/main.jsx", "React entry point", False),
+    ]),
+    ("Deployment Files", [
+        ("railway.json", "Railway configuration", False),
+        ("nixpacks.toml", "Build configuration", False),
+        (".gitignore", "Git ignore rules", False),
+    ]),
+    ("Documentation", [
+        ("RAILWAY_DEPLOYMENT_GUIDE.md", "Deployment guide", False),
+        ("RAILWAY_DEPLOYMENT_CHECKLIST.md", "Deployment checklist", False),
+        ("README.md", "Project documentation", False),
+    ]),
+    ("Directories", [
+        ("backend/app", "Backend application", True),
+        ("frontend/src", "Frontend source", True),
+        ("backend/alembic", "Database migrations", True),
+    ]),
+]
+
+def path_exists(path, is_directory=False):
+    """Check a file or directory against its parent's directory index"""
+    parent, name = os.path.split(path)
+    if is_directory:
+        return dir_index(parent).get(name, False)
+    return name in dir_index(parent)
 
-def check_directory(dirpath, description):
-    """Check if a directory exists"""
-    exists = os.path.isdir(dirpath)
+def print_check(path, description, exists):
     status = f"{Colors.GREEN}✓{Colors.END}" if exists else f"{Colors.RED}✗{Colors.END}"
-    print(f"{status} {dirpath:<50} {description}")
-    return exists
+    print(f"{status} {path:<50} {description}")
 
 def main():
     print(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
     print(f"{Colors.BLUE}Railway Deployment Readiness Check{Colors.END}")
     print(f"{Colors.BLUE}{'='*70}{Colors.END}\n")
     
-    checks = []
-    
-    # Backend files
-    print(f"{Colors.YELLOW}Backend Files:{Colors.END}")
-    checks.append(check_file("backend/app/main.py", "FastAPI application"))
-    checks.append(check_file("backend/requirements.txt", "Python dependencies"))
-    checks.append(check_file("backend/Procfile", "Railway start command"))
-    checks.append(check_file("backend/runtime.txt", "Python version"))
-    checks.append(check_file("backend/.env", "Environment variables"))
-    checks.append(check_file("backend/alembic.ini", "Database migrations"))
-    
-    print(f"\n{Colors.YELLOW}Frontend Files:{Colors.END}")
-    checks.append(check_file("frontend/package.json", "Node dependencies"))
-    checks.append(check_file("frontend/vite.config.js", "Vite configuration"))
-    checks.append(check_file("frontend/index.html", "HTML template"))
-    checks.append(check_file("frontend/src/main.jsx", "React entry point"))
+    # Read every parent directory concurrently up front; the report below is then pure lookups
+    parents = {os.path.dirname(path) for _, entries in CHECKS for path, _, _ in entries}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(dir_index, parents))
     
-    print(f"\n{Colors.YELLOW}Deployment Files:{Colors.END}")
-    checks.append(check_file("railway.json", "Railway configuration"))
-    checks.append(check_file("nixpacks.toml", "Build configuration"))
-    checks.append(check_file(".gitignore", "Git ignore rules"))
-    
-    print(f"\n{Colors.YELLOW}Documentation:{Colors.END}")
-    checks.append(check_file("RAILWAY_DEPLOYMENT_GUIDE.md", "Deployment guide"))
-    checks.append(check_file("RAILWAY_DEPLOYMENT_CHECKLIST.md", "Deployment checklist"))
-    checks.append(check_file("README.md", "Project documentation"))
-    
-    print(f"\n{Colors.YELLOW}Directories:{Colors.END}")
-    checks.append(check_directory("backend/app", "Backend application"))
-    checks.append(check_directory("frontend/src", "Frontend source"))
-    checks.append(check_directory("backend/alembic", "Database migrations"))
+    checks = []
+    for index, (section, entries) in enumerate(CHECKS):
+        prefix = "\n" if index else ""
+        print(f"{prefix}{Colors.YELLOW}{section}:{Colors.END}")
+        for path, description, is_directory in entries:
+            exists = path_exists(path, is_directory)
+            print_check(path, description, exists)
+            checks.append(exists)
     
     # Summary
     print(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
@@ -89,17 +131,15 @@ def main():
     
     # Check requirements.txt content
     if os.path.exists("backend/requirements.txt"):
-        with open("backend/requirements.txt", "r") as f:
-            lines = [l.strip() for l in f.readlines() if l.strip() and not l.startswith("#")]
-            print(f"{Colors.GREEN}✓{Colors.END} {len(lines)} Python packages in requirements.txt")
+        with open("backend/requirements.txt", "r", encoding="utf-8") as f:
+            package_count = sum(1 for l in f if (s := l.strip()) and not s.startswith("#"))
+        print(f"{Colors.GREEN}✓{Colors.END} {package_count} Python packages in requirements.txt")
     
     # Check package.json
     if os.path.exists("frontend/package.json"):
-        import json
-        with open("frontend/package.json", "r") as f:
-            pkg = json.load(f)
-            deps = len(pkg.get("dependencies", {}))
-            print(f"{Colors.GREEN}✓{Colors.END} {deps} Node packages in package.json")
+        pkg = load_json("frontend/package.json")
+        deps = len(pkg.get("dependencies", {}))
+        print(f"{Colors.GREEN}✓{Colors.END} {deps} Node packages in package.json")
     
     print(f"\n{Colors.BLUE}Next Steps:{Colors.END}")
     print("1. Push code to GitHub")
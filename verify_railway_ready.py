@@ -6,22 +6,54 @@ Checks all necessary files and configurations before deployment
 
 import os
 import json
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+@lru_cache(maxsize=None)
+def dir_index(parent):
+    """Names of the entries in a directory, read with a single scandir"""
+    try:
+        with os.scandir(parent or ".") as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
 def check_file_exists(filepath, description):
     """Check if a file exists"""
-    exists = Path(filepath).exists()
+    parent, name = os.path.split(filepath)
+    exists = name in dir_index(parent)
     status = "✅" if exists else "❌"
     print(f"{status} {description}: {filepath}")
     return exists
 
+@lru_cache(maxsize=None)
+def count_files(dirpath):
+    """Count regular files below a directory using the type info scandir already has"""
+    stack = [dirpath]
+    count = 0
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    count += 1
+    return count
+
 def check_directory_exists(dirpath, description):
     """Check if a directory exists and has content"""
-    path = Path(dirpath)
-    exists = path.exists() and path.is_dir()
+    exists = os.path.isdir(dirpath)
     if exists:
-        files = list(path.rglob("*"))
-        file_count = len([f for f in files if f.is_file()])
+        file_count = count_files(dirpath)
         status = "✅"
         print(f"{status} {description}: {dirpath} ({file_count} files)")
     else:
@@ -29,16 +61,31 @@ def check_directory_exists(dirpath, description):
         print(f"{status} {description}: {dirpath} (NOT FOUND)")
     return exists
 
+@lru_cache(maxsize=None)
+def _parse_json(filepath, mtime_ns):
+    if not ORJSON_AVAILABLE:
+        return json.loads(Path(filepath).read_bytes())
+    # orjson parses straight from the mapped pages, without first copying the file into bytes
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+def load_json(filepath):
+    """Parse a JSON file once per modification time"""
+    return _parse_json(filepath, os.stat(filepath).st_mtime_ns)
+
 def check_json_file(filepath, description):
-    """Check if JSON file is valid"""
+    """Check if JSON file is valid, returning the parsed content or None"""
     try:
-        with open(filepath, 'r') as f:
-            json.load(f)
+        data = load_json(filepath)
         print(f"✅ {description}: {filepath} (Valid JSON)")
-        return True
+        return data
     except Exception as e:
         print(f"❌ {description}: {filepath} (Invalid: {e})")
-        return False
+        return None
 
 def check_env_example():
     """Check if .env.example has required variables"""
@@ -58,57 +105,93 @@ def check_env_example():
         print(f"❌ backend/.env.example not found")
         return False
 
+CORE_FILES = [
+    ("railway.json", "Railway config"),
+    ("nixpacks.toml", "Nixpacks config"),
+    ("Dockerfile", "Dockerfile"),
+    ("docker-compose.yml", "Docker Compose"),
+    (".dockerignore", "Docker ignore"),
+]
+BACKEND_FILES = [
+    ("backend/requirements.txt", "Python dependencies"),
+    ("backend/app/main.py", "Main application"),
+    ("backend/Procfile", "Procfile"),
+    ("backend/runtime.txt", "Python runtime"),
+]
+FRONTEND_FILES = [
+    ("frontend/package.json", "Package config"),
+    ("frontend/vite.config.js", "Vite config"),
+    ("frontend/.env.production", "Production env"),
+    ("frontend/index.html", "HTML entry"),
+]
+MODEL_DIRECTORIES = [
+    ("models", "Models directory"),
+    ("models/pulse", "Pulse models"),
+]
+JSON_FILES = [
+    ("railway.json", "Railway config"),
+    ("frontend/package.json", "Package.json"),
+]
+DOCUMENTATION_FILES = [
+    ("README.md", "README"),
+    ("SINGLE_RAILWAY_DEPLOYMENT.md", "Deployment guide"),
+    ("RAILWAY_DEPLOYMENT_FIX.md", "Fix documentation"),
+]
+
+def prefetch():
+    """Do the filesystem work for every check concurrently; the checks then hit the caches"""
+    files = CORE_FILES + BACKEND_FILES + FRONTEND_FILES + DOCUMENTATION_FILES
+    parents = {os.path.dirname(path) for path, _ in files}
+    directories = [path for path, _ in MODEL_DIRECTORIES if os.path.isdir(path)]
+    # Errors stay in the discarded futures; the checks hit them again and report them
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for parent in parents:
+            executor.submit(dir_index, parent)
+        for path in directories:
+            executor.submit(count_files, path)
+        for path, _ in JSON_FILES:
+            executor.submit(load_json, path)
+
 def main():
     print("=" * 60)
     print("🚀 Railway Deployment Readiness Check")
     print("=" * 60)
     print()
     
+    prefetch()
     checks = []
     
     # Core deployment files
     print("📋 Core Deployment Files:")
-    checks.append(check_file_exists("railway.json", "Railway config"))
-    checks.append(check_file_exists("nixpacks.toml", "Nixpacks config"))
-    checks.append(check_file_exists("Dockerfile", "Dockerfile"))
-    checks.append(check_file_exists("docker-compose.yml", "Docker Compose"))
-    checks.append(check_file_exists(".dockerignore", "Docker ignore"))
+    checks.extend(check_file_exists(path, description) for path, description in CORE_FILES)
     print()
     
     # Backend files
     print("🐍 Backend Files:")
-    checks.append(check_file_exists("backend/requirements.txt", "Python dependencies"))
-    checks.append(check_file_exists("backend/app/main.py", "Main application"))
-    checks.append(check_file_exists("backend/Procfile", "Procfile"))
-    checks.append(check_file_exists("backend/runtime.txt", "Python runtime"))
+    checks.extend(check_file_exists(path, description) for path, description in BACKEND_FILES)
     checks.append(check_env_example())
     print()
     
     # Frontend files
     print("⚛️  Frontend Files:")
-    checks.append(check_file_exists("frontend/package.json", "Package config"))
-    checks.append(check_file_exists("frontend/vite.config.js", "Vite config"))
-    checks.append(check_file_exists("frontend/.env.production", "Production env"))
-    checks.append(check_file_exists("frontend/index.html", "HTML entry"))
+    checks.extend(check_file_exists(path, description) for path, description in FRONTEND_FILES)
     print()
     
     # Models directory
     print("🤖 AI Models:")
-    checks.append(check_directory_exists("models", "Models directory"))
-    checks.append(check_directory_exists("models/pulse", "Pulse models"))
+    checks.extend(check_directory_exists(path, description) for path, description in MODEL_DIRECTORIES)
     print()
     
     # JSON validation
     print("📝 JSON File Validation:")
-    checks.append(check_json_file("railway.json", "Railway config"))
-    checks.append(check_json_file("frontend/package.json", "Package.json"))
+    checks.extend(
+        check_json_file(path, description) is not None for path, description in JSON_FILES
+    )
     print()
     
     # Documentation
     print("📚 Documentation:")
-    checks.append(check_file_exists("README.md", "README"))
-    checks.append(check_file_exists("SINGLE_RAILWAY_DEPLOYMENT.md", "Deployment guide"))
-    checks.append(check_file_exists("RAILWAY_DEPLOYMENT_FIX.md", "Fix documentation"))
+    checks.extend(check_file_exists(path, description) for path, description in DOCUMENTATION_FILES)
     print()
     
     # Git status
@@ -120,11 +203,12 @@ def main():
         if result.returncode == 0:
             changes = result.stdout.strip()
             if changes:
+                lines = changes.split('\n')
                 print(f"⚠️  Uncommitted changes detected:")
-                for line in changes.split('\n')[:5]:  # Show first 5
+                for line in lines[:5]:  # Show first 5
                     print(f"   {line}")
-                if len(changes.split('\n')) > 5:
-                    print(f"   ... and {len(changes.split('\n')) - 5} more")
+                if len(lines) > 5:
+                    print(f"   ... and {len(lines) - 5} more")
                 checks.append(False)
             else:
                 print(f"✅ No uncommitted changes")
@@ -0,0 +1,58 @@
+# voice_services/buffer_pool.py
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Deque, Tuple
+
+
+class AudioBufferPool:
+    """Reusable bytearrays in fixed size classes, so audio work buffers aren't reallocated per request"""
+    
+    def __init__(self, sizes: Tuple[int, ...] = (16384, 65536, 262144, 1048576),
+                 per_class: int = 32):
+        self.sizes = tuple(sorted(sizes))
+        self.per_class = per_class
+        self._free: Dict[int, Deque[bytearray]] = {size: deque() for size in self.sizes}
+        self._lock = threading.Lock()
+    
+    def acquire(self, min_size: int) -> bytearray:
+        """Buffer of at least min_size bytes from the smallest fitting class; contents are stale"""
+        index = bisect_left(self.sizes, min_size)
+        if index == len(self.sizes):
+            # Larger than every class: allocate, and let release() drop it
+            return bytearray(min_size)
+        size = self.sizes[index]
+        with self._lock:
+            free = self._free[size]
+            if free:
+                return free.pop()
+        return bytearray(size)
+    
+    def release(self, buffer: bytearray) -> None:
+        """Return a buffer to its class; oversized buffers and overflow are left to the GC"""
+        free = self._free.get(len(buffer))
+        if free is None:
+            return
+        with self._lock:
+            if len(free) < self.per_class:
+                free.append(buffer)
+    
+    def buffer(self, min_size: int) -> "PooledBuffer":
+        return PooledBuffer(self, min_size)
+
+
+class PooledBuffer:
+    """Context manager that hands out a pooled buffer and returns it on exit"""
+    
+    def __init__(self, pool: AudioBufferPool, min_size: int):
+        self.pool = pool
+        self.min_size = min_size
+        self.data = None
+    
+    def __enter__(self) -> bytearray:
+        self.data = self.pool.acquire(self.min_size)
+        return self.data
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.pool.release(self.data)
+        self.data = None
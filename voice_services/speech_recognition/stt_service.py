@@ -1,65 +1,128 @@
 # voice_services/speech_recognition/stt_service.py
 import os
 import asyncio
-from typing import Dict, Any, Optional
-import speech_recognition as sr
-from google.cloud import speech_v1
-import azure.cognitiveservices.speech as speechsdk
-import vosk
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Optional
 import json
+from types import MappingProxyType
+
+# Phrases boosted when recognizing symptom descriptions
+MEDICAL_PHRASES = (
+    "headache", "fever", "cough", "pain", "fatigue",
+    "insomnia", "anxiety", "constipation", "heartburn"
+)
+
+# Language mappings
+LANGUAGE_CODES = MappingProxyType({
+    'en': 'en-US',
+    'hi': 'hi-IN',
+    'ta': 'ta-IN',
+    'te': 'te-IN',
+    'kn': 'kn-IN',
+    'ml': 'ml-IN',
+    'bn': 'bn-IN',
+    'gu': 'gu-IN',
+    'mr': 'mr-IN',
+    'pa': 'pa-IN',
+    'ur': 'ur-PK'
+})
+
+# Languages with offline Vosk models
+VOSK_LANGUAGES = ('en', 'hi', 'ta', 'te')
+
+# Languages routed to Google Cloud, and the contexts that change its config
+GOOGLE_LANGUAGES = ('en', 'hi')
+GOOGLE_CONTEXTS = ('general', 'medical', 'medical_symptoms')
 
 class SpeechToTextService:
     """Multi-engine speech recognition service"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], langs: Optional[Iterable[str]] = None):
         self.config = config
         
-        # Initialize different STT engines
-        self.recognizer = sr.Recognizer()
+        # Cloud SDKs are imported only for the engines this deployment configures
+        self._recognizer = None
+        self._speech_v1 = None
+        self._speechsdk = None
         
         # Google Cloud Speech-to-Text
         self.google_client = None
         if config.get('GOOGLE_APPLICATION_CREDENTIALS'):
-            self.google_client = speech_v1.SpeechClient()
+            from google.cloud import speech_v1
+            self._speech_v1 = speech_v1
+            self.google_client = speech_v1.SpeechAsyncClient()
         
         # Azure Speech Services
         self.azure_config = None
         if config.get('AZURE_SPEECH_KEY'):
+            import azure.cognitiveservices.speech as speechsdk
+            self._speechsdk = speechsdk
             self.azure_config = speechsdk.SpeechConfig(
                 subscription=config['AZURE_SPEECH_KEY'],
                 region=config.get('AZURE_SPEECH_REGION', 'eastus')
             )
+        # Per-language speech configs, so concurrent requests never retarget a shared one
+        self._azure_speech_configs: Dict[str, Any] = {}
         
-        # Vosk (offline) models
+        # Vosk (offline) models; only the requested languages load up front, others via load_language
         self.vosk_models = {}
-        self._load_vosk_models()
-        
-        # Language mappings
-        self.language_codes = {
-            'en': 'en-US',
-            'hi': 'hi-IN',
-            'ta': 'ta-IN',
-            'te': 'te-IN',
-            'kn': 'kn-IN',
-            'ml': 'ml-IN',
-            'bn': 'bn-IN',
-            'gu': 'gu-IN',
-            'mr': 'mr-IN',
-            'pa': 'pa-IN',
-            'ur': 'ur-PK'
-        }
+        self._vosk_executor = None
+        self._load_vosk_models(VOSK_LANGUAGES if langs is None else langs)
+        
+        # Language mappings (shared, read-only)
+        self.language_codes = LANGUAGE_CODES
+        
+        # Google recognition configs per (language, context), built once up front
+        self._google_configs: Dict[tuple, Any] = {}
+        if self.google_client:
+            for language in GOOGLE_LANGUAGES:
+                for context in GOOGLE_CONTEXTS:
+                    self._google_config(language, context)
+    
+    @property
+    def recognizer(self):
+        """SpeechRecognition fallback recognizer, created on first use"""
+        if self._recognizer is None:
+            import speech_recognition as sr
+            self._recognizer = sr.Recognizer()
+        return self._recognizer
     
-    def _load_vosk_models(self):
-        """Load Vosk models for offline recognition"""
+    def _load_vosk_models(self, langs: Iterable[str]):
+        """Start loading Vosk models for offline recognition in the background"""
+        for lang in langs:
+            self.load_language(lang)
+    
+    def load_language(self, lang: str):
+        """Start loading the offline model for a language, if it has one and it isn't loaded yet"""
+        if lang in self.vosk_models or lang not in VOSK_LANGUAGES:
+            return
         model_dir = self.config.get('VOSK_MODEL_DIR', 'voice_services/models/vosk_models/')
-        if os.path.exists(model_dir):
-            for lang in ['en', 'hi', 'ta', 'te']:
-                lang_dir = os.path.join(model_dir, lang)
-                if os.path.exists(lang_dir):
-                    try:
-                        self.vosk_models[lang] = vosk.Model(lang_dir)
-                    except:
-                        pass
+        lang_dir = os.path.join(model_dir, lang)
+        if not os.path.exists(lang_dir):
+            return
+        try:
+            import vosk
+        except ImportError:
+            return
+        
+        # Models are large and load concurrently; each future is resolved on first use
+        if self._vosk_executor is None:
+            self._vosk_executor = ThreadPoolExecutor(
+                max_workers=len(VOSK_LANGUAGES), thread_name_prefix='vosk-load'
+            )
+        self.vosk_models[lang] = self._vosk_executor.submit(vosk.Model, lang_dir)
+    
+    def _vosk_model(self, language: str):
+        """Loaded Vosk model for a language, or None if it failed to load"""
+        model = self.vosk_models.get(language)
+        if isinstance(model, Future):
+            try:
+                model = model.result()
+            except Exception:
+                self.vosk_models.pop(language, None)
+                return None
+            self.vosk_models[language] = model
+        return model
     
     async def recognize(self, audio_data: bytes, 
                        language: str = 'en',
@@ -75,20 +138,21 @@ class SpeechToTextService:
         """
         try:
             # Try Google Cloud first
-            if self.google_client and language in ['en', 'hi']:
+            if self.google_client and language in GOOGLE_LANGUAGES:
                 return await self._recognize_google(audio_data, language, context)
             
             # Try Azure for Indian languages
-            elif self.azure_config and language in self.language_codes:
+            if self.azure_config and language in self.language_codes:
                 return await self._recognize_azure(audio_data, language, context)
             
-            # Try Vosk offline
-            elif language in self.vosk_models:
-                return await self._recognize_vosk(audio_data, language)
+            # Try Vosk offline; waiting on a model still loading blocks, so do it off the loop
+            if language in self.vosk_models:
+                model = await asyncio.to_thread(self._vosk_model, language)
+                if model is not None:
+                    return await self._recognize_vosk(audio_data, model)
             
             # Fallback to SpeechRecognition
-            else:
-                return await self._recognize_sr(audio_data, language)
+            return await self._recognize_sr(audio_data, language)
                 
         except Exception as e:
             return {
@@ -102,29 +166,12 @@ class SpeechToTextService:
                               language: str, 
                               context: str) -> Dict[str, Any]:
         """Use Google Cloud Speech-to-Text"""
-        # Configure for medical context
-        if context == 'medical_symptoms':
-            phrases = [
-                "headache", "fever", "cough", "pain", "fatigue",
-                "insomnia", "anxiety", "constipation", "heartburn"
-            ]
-            speech_contexts = [speech_v1.SpeechContext(phrases=phrases)]
-        else:
-            speech_contexts = []
-        
-        # Configure audio
-        audio = speech_v1.RecognitionAudio(content=audio_data)
-        config = speech_v1.RecognitionConfig(
-            encoding=speech_v1.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=16000,
-            language_code=self.language_codes.get(language, 'en-US'),
-            speech_contexts=speech_contexts,
-            enable_automatic_punctuation=True,
-            model='medical_dictation' if context == 'medical' else 'default'
-        )
+        # Only the audio is built per request
+        audio = self._speech_v1.RecognitionAudio(content=audio_data)
+        config = self._google_config(language, context)
         
-        # Send request
-        response = self.google_client.recognize(config=config, audio=audio)
+        # Send request without blocking the event loop
+        response = await self.google_client.recognize(config=config, audio=audio)
         
         if response.results:
             result = response.results[0]
@@ -143,41 +190,98 @@ class SpeechToTextService:
             'confidence': 0.0
         }
     
+    async def _recognize_vosk(self, audio_data: bytes, model) -> Dict[str, Any]:
+        """Use an offline Vosk model"""
+        import vosk
+        
+        def recognize_sync() -> Dict[str, Any]:
+            recognizer = vosk.KaldiRecognizer(model, 16000)
+            recognizer.AcceptWaveform(audio_data)
+            return json.loads(recognizer.FinalResult())
+        
+        # Decoding is CPU-bound; keep it off the event loop
+        result = await asyncio.to_thread(recognize_sync)
+        text = result.get('text', '')
+        
+        return {
+            'success': bool(text),
+            'text': text,
+            'confidence': 0.7 if text else 0.0,  # Vosk reports no utterance-level confidence
+            'alternatives': []
+        }
+    
+    async def _recognize_sr(self, audio_data: bytes, language: str) -> Dict[str, Any]:
+        """Use the SpeechRecognition library (free Google Web Speech endpoint)"""
+        import speech_recognition as sr
+        
+        audio = sr.AudioData(audio_data, 16000, 2)
+        try:
+            text = await asyncio.to_thread(
+                self.recognizer.recognize_google, audio,
+                language=self.language_codes.get(language, 'en-US')
+            )
+        except sr.UnknownValueError:
+            text = ''
+        
+        return {
+            'success': bool(text),
+            'text': text,
+            'confidence': 0.6 if text else 0.0,  # No confidence from the free endpoint
+            'alternatives': []
+        }
+    
+    def _google_config(self, language: str, context: str):
+        """Recognition config for a language and context, built once and reused"""
+        # Contexts other than the medical ones all share the default config
+        if context not in GOOGLE_CONTEXTS:
+            context = 'general'
+        key = (language, context)
+        config = self._google_configs.get(key)
+        if config is None:
+            speech_v1 = self._speech_v1
+            # Configure for medical context
+            if context == 'medical_symptoms':
+                speech_contexts = [speech_v1.SpeechContext(phrases=list(MEDICAL_PHRASES))]
+            else:
+                speech_contexts = []
+            config = speech_v1.RecognitionConfig(
+                encoding=speech_v1.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=16000,
+                language_code=self.language_codes.get(language, 'en-US'),
+                speech_contexts=speech_contexts,
+                enable_automatic_punctuation=True,
+                model='medical_dictation' if context == 'medical' else 'default'
+            )
+            self._google_configs[key] = config
+        return config
+    
     async def _recognize_azure(self, audio_data: bytes, 
                              language: str, 
                              context: str) -> Dict[str, Any]:
         """Use Azure Speech Services"""
-        audio_config = speechsdk.audio.AudioConfig(filename=None)
-        audio_stream = speechsdk.audio.PushAudioInputStream()
+        audio_stream = self._speechsdk.audio.PushAudioInputStream()
+        audio_config = self._speechsdk.audio.AudioConfig(stream=audio_stream)
         
         # Write audio data to stream
         audio_stream.write(audio_data)
         audio_stream.close()
         
-        # Configure recognizer
-        self.azure_config.speech_recognition_language = self.language_codes[language]
-        
-        if context == 'medical_symptoms':
-            # Enable medical phrase list
-            phrase_list_grammar = speechsdk.PhraseListGrammar.from_recognizer(
-                speechsdk.SpeechRecognizer(
-                    speech_config=self.azure_config,
-                    audio_config=audio_config
-                )
-            )
-            phrase_list_grammar.addPhrase("headache")
-            phrase_list_grammar.addPhrase("fever")
-            # Add more medical phrases
-        
-        recognizer = speechsdk.SpeechRecognizer(
-            speech_config=self.azure_config,
+        # One recognizer per request, bound to this request's audio stream
+        recognizer = self._speechsdk.SpeechRecognizer(
+            speech_config=self._azure_speech_config(language),
             audio_config=audio_config
         )
         
-        # Perform recognition
-        result = recognizer.recognize_once()
+        if context == 'medical_symptoms':
+            # Enable medical phrase list on the recognizer that does the work
+            phrase_list_grammar = self._speechsdk.PhraseListGrammar.from_recognizer(recognizer)
+            for phrase in MEDICAL_PHRASES:
+                phrase_list_grammar.addPhrase(phrase)
+        
+        # Perform recognition on a worker thread; the SDK call blocks until the service answers
+        result = await asyncio.to_thread(recognizer.recognize_once)
         
-        if result.reason == speechsdk.ResultReason.RecognizedSpeech:
+        if result.reason == self._speechsdk.ResultReason.RecognizedSpeech:
             return {
                 'success': True,
                 'text': result.text,
@@ -191,6 +295,18 @@ class SpeechToTextService:
             'confidence': 0.0
         }
     
+    def _azure_speech_config(self, language: str):
+        """Speech config for a language, created on first use and reused afterwards"""
+        speech_config = self._azure_speech_configs.get(language)
+        if speech_config is None:
+            speech_config = self._speechsdk.SpeechConfig(
+                subscription=self.config['AZURE_SPEECH_KEY'],
+                region=self.config.get('AZURE_SPEECH_REGION', 'eastus')
+            )
+            speech_config.speech_recognition_language = self.language_codes[language]
+            self._azure_speech_configs[language] = speech_config
+        return speech_config
+    
     async def detect_language(self, audio_data: bytes) -> Optional[str]:
         """Auto-detect language from audio"""
         # Try to detect using audio characteristics
@@ -1,11 +1,136 @@
 # voice_services/text_to_speech/tts_service.py
 import os
 import asyncio
-from typing import Dict, Any, Optional
-from gtts import gTTS
-import boto3
+import itertools
+import threading
+from typing import Dict, Any, Optional, AsyncIterator, Callable, Iterator, List, Sequence, Tuple
 from io import BytesIO
 import tempfile
+from types import MappingProxyType
+
+# Read size for Polly's streaming response body
+POLLY_CHUNK_SIZE = 64 * 1024
+
+# Voice profiles for different contexts
+VOICE_PROFILES = MappingProxyType({
+    'friendly': MappingProxyType({
+        'rate': 'medium',
+        'pitch': 'medium',
+        'volume': 'medium'
+    }),
+    'professional': MappingProxyType({
+        'rate': 'slow',
+        'pitch': 'low',
+        'volume': 'medium'
+    }),
+    'soothing': MappingProxyType({
+        'rate': 'slow',
+        'pitch': 'low',
+        'volume': 'soft'
+    }),
+    'authoritative': MappingProxyType({
+        'rate': 'medium',
+        'pitch': 'low',
+        'volume': 'loud'
+    }),
+    'calm': MappingProxyType({
+        'rate': 'slow',
+        'pitch': 'medium',
+        'volume': 'soft'
+    }),
+    'clear': MappingProxyType({
+        'rate': 'medium',
+        'pitch': 'medium',
+        'volume': 'medium'
+    })
+})
+
+# Language to voice mapping for Polly
+LANGUAGE_VOICES = MappingProxyType({
+    'en': MappingProxyType({'voice_id': 'Joanna', 'engine': 'neural'}),
+    'hi': MappingProxyType({'voice_id': 'Aditi', 'engine': 'standard'}),
+    'ta': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'}),
+    'te': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'}),
+    'kn': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'}),
+    'ml': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'}),
+    'bn': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'}),
+    'gu': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'}),
+    'mr': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'}),
+    'pa': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'}),
+    'ur': MappingProxyType({'voice_id': 'Kajal', 'engine': 'standard'})
+})
+
+# Prosody attributes and Polly voice per (voice_type, language), built once at import
+SSML_TABLE = MappingProxyType({
+    (voice_type, language): (
+        f'pitch="{profile["pitch"]}" volume="{profile["volume"]}"',
+        voice_config['voice_id'],
+        voice_config['engine']
+    )
+    for (voice_type, profile), (language, voice_config)
+    in itertools.product(VOICE_PROFILES.items(), LANGUAGE_VOICES.items())
+})
+
+
+def _gtts_bytes(text: str, language: str, slow: bool) -> bytes:
+    """Synthesize with gTTS into memory; blocking, so callers run it on a worker thread"""
+    from gtts import gTTS
+    
+    buffer = BytesIO()
+    gTTS(text=text, lang=language, slow=slow).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+def _gtts_chunks(text: str, language: str, slow: bool) -> Iterator[bytes]:
+    """gTTS audio as it arrives, one chunk per synthesized text part; blocking"""
+    from gtts import gTTS
+    
+    yield from gTTS(text=text, lang=language, slow=slow).stream()
+
+
+async def _stream_from_thread(produce: Callable[..., Iterator[bytes]],
+                              *args) -> AsyncIterator[Tuple[bytes, bool]]:
+    """
+    Drive a blocking chunk generator on a worker thread
+    
+    Yields (chunk, is_final) pairs; one chunk is held back so the last one
+    can be flagged. Errors raised by the generator are re-raised here.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+    done = object()
+    
+    def put(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop already closed; the consumer is gone
+            stop.set()
+    
+    def pump():
+        try:
+            for chunk in produce(*args):
+                if stop.is_set():
+                    return
+                put(chunk)
+        except Exception as e:
+            put(e)
+        finally:
+            put(done)
+    
+    loop.run_in_executor(None, pump)
+    try:
+        pending = None
+        while (item := await queue.get()) is not done:
+            if isinstance(item, Exception):
+                raise item
+            if pending is not None:
+                yield pending, False
+            pending = item
+        yield (pending if pending is not None else b''), True
+    finally:
+        stop.set()
 
 class TextToSpeechService:
     """Multi-engine text-to-speech service"""
@@ -16,6 +141,8 @@ class TextToSpeechService:
         # Amazon Polly client (for Indian languages)
         self.polly_client = None
         if config.get('AWS_ACCESS_KEY_ID') and config.get('AWS_SECRET_ACCESS_KEY'):
+            # boto3 is only imported when Polly is actually configured
+            import boto3
             self.polly_client = boto3.client(
                 'polly',
                 aws_access_key_id=config['AWS_ACCESS_KEY_ID'],
@@ -23,54 +150,10 @@ class TextToSpeechService:
                 region_name=config.get('AWS_REGION', 'ap-south-1')
             )
         
-        # Voice profiles for different contexts
-        self.voice_profiles = {
-            'friendly': {
-                'rate': 'medium',
-                'pitch': 'medium',
-                'volume': 'medium'
-            },
-            'professional': {
-                'rate': 'slow',
-                'pitch': 'low',
-                'volume': 'medium'
-            },
-            'soothing': {
-                'rate': 'slow',
-                'pitch': 'low',
-                'volume': 'soft'
-            },
-            'authoritative': {
-                'rate': 'medium',
-                'pitch': 'low',
-                'volume': 'loud'
-            },
-            'calm': {
-                'rate': 'slow',
-                'pitch': 'medium',
-                'volume': 'soft'
-            },
-            'clear': {
-                'rate': 'medium',
-                'pitch': 'medium',
-                'volume': 'medium'
-            }
-        }
-        
-        # Language to voice mapping for Polly
-        self.language_voices = {
-            'en': {'voice_id': 'Joanna', 'engine': 'neural'},
-            'hi': {'voice_id': 'Aditi', 'engine': 'standard'},
-            'ta': {'voice_id': 'Kajal', 'engine': 'standard'},
-            'te': {'voice_id': 'Kajal', 'engine': 'standard'},
-            'kn': {'voice_id': 'Kajal', 'engine': 'standard'},
-            'ml': {'voice_id': 'Kajal', 'engine': 'standard'},
-            'bn': {'voice_id': 'Kajal', 'engine': 'standard'},
-            'gu': {'voice_id': 'Kajal', 'engine': 'standard'},
-            'mr': {'voice_id': 'Kajal', 'engine': 'standard'},
-            'pa': {'voice_id': 'Kajal', 'engine': 'standard'},
-            'ur': {'voice_id': 'Kajal', 'engine': 'standard'}
-        }
+        # Shared, read-only tables
+        self.voice_profiles = VOICE_PROFILES
+        self.language_voices = LANGUAGE_VOICES
+        self._ssml_cache = SSML_TABLE
     
     async def synthesize(self, text: str, 
                         language: str = 'en',
@@ -105,69 +188,116 @@ class TextToSpeechService:
                 'format': None
             }
     
+    async def synthesize_batch(self, texts: Sequence[str],
+                               language: str = 'en',
+                               voice_type: str = 'friendly',
+                               speed: float = 1.0) -> List[Dict[str, Any]]:
+        """
+        Convert several texts with the same voice settings
+        
+        Identical texts are synthesized once. None of the engines has a batch
+        endpoint, so the distinct texts are synthesized concurrently.
+        Results are in the order of texts.
+        """
+        unique = list(dict.fromkeys(texts))
+        results = await asyncio.gather(*(
+            self.synthesize(text, language=language, voice_type=voice_type, speed=speed)
+            for text in unique
+        ))
+        by_text = dict(zip(unique, results))
+        return [by_text[text] for text in texts]
+    
+    async def synthesize_stream(self, text: str,
+                                language: str = 'en',
+                                voice_type: str = 'friendly',
+                                speed: float = 1.0) -> AsyncIterator[Tuple[bytes, bool]]:
+        """
+        Convert text to speech, yielding encoded audio as it is produced
+        
+        Same engine priority as synthesize(). Yields (mp3_chunk, is_final)
+        pairs; the first chunk is available long before synthesis finishes.
+        """
+        if self.polly_client:
+            chunks = _stream_from_thread(
+                self._polly_chunks, *self._polly_request(text, language, voice_type, speed)
+            )
+        else:
+            chunks = _stream_from_thread(
+                _gtts_chunks, self._gtts_text(text, speed), language, speed < 0.8
+            )
+        async for chunk, final in chunks:
+            yield chunk, final
+    
+    def _polly_request(self, text: str, language: str,
+                       voice_type: str, speed: float) -> Tuple[str, str, str]:
+        """SSML text, voice id and engine for a Polly request"""
+        # Unknown voice types and languages fall back to the friendly English voice
+        if voice_type not in self.voice_profiles:
+            voice_type = 'friendly'
+        if language not in self.language_voices:
+            language = 'en'
+        prosody, voice_id, engine = self._ssml_cache[(voice_type, language)]
+        
+        # SSML for better speech control
+        ssml_text = f'<speak><prosody rate="{speed}" {prosody}>{text}</prosody></speak>'
+        return ssml_text, voice_id, engine
+    
     async def _synthesize_polly(self, text: str, 
                               language: str, 
                               voice_type: str,
                               speed: float) -> Dict[str, Any]:
         """Use Amazon Polly for high-quality speech"""
-        voice_config = self.language_voices.get(language, self.language_voices['en'])
-        
-        # Apply voice profile
-        profile = self.voice_profiles.get(voice_type, self.voice_profiles['friendly'])
-        
-        # SSML for better speech control
-        ssml_text = f"""
-        <speak>
-            <prosody rate="{speed}" pitch="{profile['pitch']}" volume="{profile['volume']}">
-                {text}
-            </prosody>
-        </speak>
-        """
-        
-        # Request synthesis
-        response = self.polly_client.synthesize_speech(
-            Text=ssml_text,
-            TextType='ssml',
-            OutputFormat='mp3',
-            VoiceId=voice_config['voice_id'],
-            Engine=voice_config['engine']
+        # Request synthesis and drain the audio stream off the event loop
+        audio_data = await asyncio.to_thread(
+            self._polly_bytes, *self._polly_request(text, language, voice_type, speed)
         )
         
-        # Read audio stream
-        audio_stream = response['AudioStream'].read()
-        
         return {
             'success': True,
-            'audio_data': audio_stream,
+            'audio_data': audio_data,
             'format': 'mp3',
-            'duration': len(audio_stream) / 16000  # Approximate duration
+            'duration': len(audio_data) / 16000  # Approximate duration
         }
     
-    async def _synthesize_gtts(self, text: str, 
-                             language: str, 
-                             speed: float) -> Dict[str, Any]:
-        """Use Google Text-to-Speech (free)"""
-        # Adjust speed (Google TTS has limited speed control)
+    def _polly_chunks(self, ssml_text: str, voice_id: str, engine: str) -> Iterator[bytes]:
+        """Synthesize with Polly, reading the audio stream in fixed-size chunks; blocking"""
+        response = self.polly_client.synthesize_speech(
+            Text=ssml_text,
+            TextType='ssml',
+            OutputFormat='mp3',
+            VoiceId=voice_id,
+            Engine=engine
+        )
+        yield from response['AudioStream'].iter_chunks(POLLY_CHUNK_SIZE)
+    
+    def _polly_bytes(self, ssml_text: str, voice_id: str, engine: str) -> bytes:
+        """Synthesize with Polly into one buffer"""
+        buffer = bytearray()
+        for chunk in self._polly_chunks(ssml_text, voice_id, engine):
+            buffer.extend(chunk)
+        return bytes(buffer)
+    
+    @staticmethod
+    def _gtts_text(text: str, speed: float) -> str:
+        """Adjust speed (Google TTS has limited speed control)"""
         if speed < 0.8:
             # Add pauses for slower speech
             text = text.replace('.', '. ')
             text = text.replace(',', ', ')
+        return text
+    
+    async def _synthesize_gtts(self, text: str, 
+                             language: str, 
+                             speed: float) -> Dict[str, Any]:
+        """Use Google Text-to-Speech (free)"""
+        text = self._gtts_text(text, speed)
         
-        # Create TTS object
-        tts = gTTS(
-            text=text,
-            lang=language,
-            slow=(speed < 0.8)
-        )
-        
-        # Save to bytes buffer
-        buffer = BytesIO()
-        tts.write_to_fp(buffer)
-        buffer.seek(0)
+        # Synthesize off the event loop
+        audio_data = await asyncio.to_thread(_gtts_bytes, text, language, speed < 0.8)
         
         return {
             'success': True,
-            'audio_data': buffer.read(),
+            'audio_data': audio_data,
             'format': 'mp3',
             'duration': len(text) / 15  # Approximate: 15 chars per second
         }
\ No newline at end of file
@@ -2,10 +2,36 @@
 import os
 import json
 import asyncio
-from typing import Dict, Any, Optional, BinaryIO
+import contextlib
+import functools
+import hashlib
+import inspect
+import re
+from typing import Dict, Any, List, Optional, BinaryIO, AsyncIterator
 from datetime import datetime
 import tempfile
+import time
 import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+
+import numpy as np
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    xxhash = None
+    XXHASH_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    hyperscan = None
+    HYPERSCAN_AVAILABLE = False
 
 from .speech_recognition.stt_service import SpeechToTextService
 from .text_to_speech.tts_service import TextToSpeechService
@@ -14,18 +40,257 @@ from .audio_processing.audio_utils import AudioProcessor
 
 logger = logging.getLogger(__name__)
 
+# Languages whose models load at startup unless config['enabled_languages'] says otherwise
+DEFAULT_ENABLED_LANGUAGES = ('en', 'hi')
+
+# Synthesized results kept for repeated (text, language, voice_type, speed) requests.
+# Only short prompts are cached; long one-off audio (reports, replies) is not.
+TTS_CACHE_MAX_BYTES = 32 * 1024 * 1024
+TTS_CACHE_MAX_ENTRY_BYTES = 256 * 1024
+
+# Recently preprocessed clips kept by content hash, for audio passed between stages
+PROCESSED_AUDIO_CACHE_SIZE = 32
+
+# Streamed assistant text is spoken per sentence, or after this many tokens without one
+SPEECH_CHUNK_MAX_TOKENS = 40
+
+# Most TTS requests dispatched together when config['tts_batch_window_ms'] enables batching
+TTS_BATCH_MAX_SIZE = 16
+SENTENCE_ENDINGS = ('.', '!', '?', '।')
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?।])\s+')
+
+
+# Symptom vocabulary per language as (symptom, pattern); other languages use English.
+# English terms are bounded to whole words so "distress" or "room temperature" don't match
+SYMPTOM_PATTERNS = {
+    'en': (
+        ('headache', r'\b(?:head ?aches?|migraines?)\b'),
+        ('fever', r'\b(?:fever(?:s|ish)?|(?:high|running a) temperature)\b'),
+        ('cough', r'\bcough(?:s|ing)?\b'),
+        ('fatigue', r'\b(?:tired|fatigued?|exhausted)\b'),
+        ('insomnia', r"\b(?:insomnia|can'?t sleep|trouble sleeping)\b"),
+        ('anxiety', r'\b(?:anxiety|anxious|stress(?:ed|ful)?)\b'),
+        ('constipation', r'\bconstipat(?:ed|ion)\b'),
+        ('heartburn', r'\b(?:heartburn|acidity|acid reflux)\b'),
+        ('stomach_pain', r'\b(?:stomach ?aches?|stomach pain|abdominal pain)\b'),
+        ('joint_pain', r'\b(?:joint pains?|aching joints)\b')
+    ),
+    'hi': (
+        ('headache', r'सिरदर्द|सिर दर्द'),
+        ('fever', r'बुखार'),
+        ('cough', r'खांसी|खाँसी'),
+        ('fatigue', r'थकान|थका'),
+        ('insomnia', r'अनिद्रा|नींद नहीं'),
+        ('anxiety', r'चिंता|तनाव'),
+        ('constipation', r'कब्ज'),
+        ('heartburn', r'सीने में जलन|एसिडिटी'),
+        ('stomach_pain', r'पेट दर्द|पेट में दर्द'),
+        ('joint_pain', r'जोड़ों में दर्द|जोड़ों का दर्द')
+    )
+}
+
+
+def _build_symptom_scanners() -> Dict[str, Any]:
+    """
+    One compiled matcher per language covering all its symptom patterns
+    
+    Hyperscan databases when available, otherwise a single regex alternation
+    of atomic named groups; either way a transcript is scanned in one pass.
+    """
+    scanners = {}
+    for lang, patterns in SYMPTOM_PATTERNS.items():
+        if HYPERSCAN_AVAILABLE:
+            database = hyperscan.Database()
+            flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+            database.compile(
+                expressions=[pattern.encode('utf-8') for _, pattern in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[flags] * len(patterns)
+            )
+            scanners[lang] = database
+        else:
+            scanners[lang] = re.compile(
+                '|'.join(f'(?P<s{index}>(?>{pattern}))' for index, (_, pattern) in enumerate(patterns)),
+                re.IGNORECASE
+            )
+    return scanners
+
+
+_SYMPTOM_SCANNERS = _build_symptom_scanners()
+
+
+def _match_symptoms(text: str, language: str) -> List[str]:
+    """Symptoms mentioned in text, in order of first mention"""
+    lang = language if language in SYMPTOM_PATTERNS else 'en'
+    patterns = SYMPTOM_PATTERNS[lang]
+    scanner = _SYMPTOM_SCANNERS[lang]
+    indices = []
+    if HYPERSCAN_AVAILABLE:
+        def on_match(pattern_id, start, end, flags, context):
+            indices.append(pattern_id)
+        scanner.scan(text.encode('utf-8'), match_event_handler=on_match)
+    else:
+        for match in scanner.finditer(text):
+            indices.append(int(match.lastgroup[1:]))
+    return list(dict.fromkeys(patterns[index][0] for index in indices))
+
+
+# Spoken report sections per language, in chapter order
+REPORT_TEMPLATES = {
+    'en': (
+        "Aayur AI Diagnosis Report for {patient_name}.",
+        "Your Ayurvedic analysis shows {imbalance} {dominant_dosha} imbalance.",
+        "Dietary Recommendations:\n{dietary}",
+        "Lifestyle Changes:\n{lifestyle}",
+        "Herbal Remedies:\n{herbs}",
+        "This concludes your Aayur AI diagnosis report.\n"
+        "For personalized treatment, consult a qualified Ayurvedic practitioner."
+    ),
+    'hi': (
+        "{patient_name} के लिए आयुर एआई निदान रिपोर्ट।",
+        "आपके आयुर्वेदिक विश्लेषण में {imbalance} {dominant_dosha} असंतुलन दिखाई देता है।",
+        "आहार संबंधी सुझाव:\n{dietary}",
+        "जीवनशैली में बदलाव:\n{lifestyle}",
+        "हर्बल उपचार:\n{herbs}",
+        "आपकी आयुर एआई निदान रिपोर्ट यहीं समाप्त होती है।\n"
+        "व्यक्तिगत उपचार के लिए किसी योग्य आयुर्वेदिक चिकित्सक से परामर्श लें।"
+    )
+}
+
+
+# Audio report chapter titles, one per REPORT_TEMPLATES section
+_AUDIO_CHAPTER_TITLES = (
+    'Introduction',
+    'Dosha Analysis',
+    'Dietary Recommendations',
+    'Lifestyle Changes',
+    'Herbal Remedies',
+    'Conclusion'
+)
+
+
+# Spoken guidance for tongue image capture, in step order
+_TONGUE_INSTRUCTIONS = (
+    MappingProxyType({
+        'text': 'Please open your mouth and extend your tongue naturally.',
+        'wait_time': 5,
+        'voice_type': 'calm'
+    }),
+    MappingProxyType({
+        'text': 'Make sure your tongue is relaxed, not strained.',
+        'wait_time': 3,
+        'voice_type': 'calm'
+    }),
+    MappingProxyType({
+        'text': 'Try to keep your tongue in the center, not tilted.',
+        'wait_time': 3,
+        'voice_type': 'calm'
+    }),
+    MappingProxyType({
+        'text': 'Ready? I will count down from 3. Please hold still.',
+        'wait_time': 2,
+        'voice_type': 'clear'
+    }),
+    MappingProxyType({
+        'text': '3... 2... 1...',
+        'wait_time': 3,
+        'voice_type': 'clear'
+    }),
+    MappingProxyType({
+        'text': 'Perfect! You can relax now.',
+        'wait_time': 0,
+        'voice_type': 'friendly'
+    })
+)
+TONGUE_GUIDANCE_SPEED = 0.9
+
+
+def _audio_fingerprint(audio_data: bytes) -> int:
+    """64-bit content hash of a clip"""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(audio_data)
+    return int.from_bytes(hashlib.blake2b(audio_data, digest_size=8).digest(), 'little')
+
+
+# Response timestamps have one-second resolution and are formatted once per second
+_timestamp_cache = {'second': -1, 'iso': ''}
+
+
+def _iso_timestamp() -> str:
+    """Current local time in ISO 8601, reformatted only when the second changes"""
+    second = int(time.time())
+    if second != _timestamp_cache['second']:
+        _timestamp_cache['iso'] = datetime.fromtimestamp(second).isoformat()
+        _timestamp_cache['second'] = second
+    return _timestamp_cache['iso']
+
+
+async def _speech_chunks(tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Group streamed tokens into sentence-sized pieces worth a TTS call"""
+    buffer = []
+    async for token in tokens:
+        buffer.append(token)
+        if (token.strip().endswith(SENTENCE_ENDINGS) or '\n' in token
+                or len(buffer) >= SPEECH_CHUNK_MAX_TOKENS):
+            chunk = ''.join(buffer).strip()
+            buffer.clear()
+            if chunk:
+                yield chunk
+    chunk = ''.join(buffer).strip()
+    if chunk:
+        yield chunk
+
+def service_result(operation: str, echo: tuple = (), **error_fields):
+    """
+    Turn an exception in a public service coroutine into its failure result
+    
+    The failure dict is {'success': False, 'error': ...} followed by
+    error_fields and the call's arguments named in echo.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                logger.error('%s error: %s', operation, e)
+                result = {'success': False, 'error': str(e), **error_fields}
+                if echo:
+                    bound = signature.bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    result.update((name, bound.arguments[name]) for name in echo)
+                return result
+        return wrapper
+    return decorator
+
+
 class AayurVoiceService:
     """Complete voice service for Aayur AI"""
     
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         
+        # Languages whose models load at startup; the rest load on first use
+        self.enabled_languages = tuple(self.config.get('enabled_languages', DEFAULT_ENABLED_LANGUAGES))
+        self._loaded_languages = set(self.enabled_languages)
+        self._language_lock = asyncio.Lock()
+        
         # Initialize services
-        self.stt_service = SpeechToTextService(config)
-        self.tts_service = TextToSpeechService(config)
-        self.assistant_service = VoiceAssistantService(config)
+        self.stt_service = SpeechToTextService(self.config, langs=self.enabled_languages)
+        self.tts_service = TextToSpeechService(self.config)
+        self.assistant_service = VoiceAssistantService(self.config)
         self.audio_processor = AudioProcessor()
         
+        # Noise reduction and normalization are CPU-bound; run them in worker processes.
+        # Spawned, not forked: the DSP kernel's threading runtime is not fork-safe.
+        self._dsp_pool = ProcessPoolExecutor(
+            max_workers=self.config.get('dsp_workers', max(1, (os.cpu_count() or 2) // 2)),
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        
         # Supported languages
         self.supported_languages = {
             'en': 'English',
@@ -40,12 +305,134 @@ class AayurVoiceService:
             'pa': 'Punjabi',
             'ur': 'Urdu'
         }
+        self._supported_languages_set = frozenset(self.supported_languages)
+        
+        # LRU of successful TTS results, without their timestamp
+        self._tts_cache: OrderedDict = OrderedDict()
+        self._tts_cache_bytes = 0
+        
+        # LRU of preprocessed audio keyed by content hash of the raw clip
+        self._processed_cache: OrderedDict = OrderedDict()
+        
+        # Optional TTS batching: requests arriving within the window share one dispatch.
+        # Queue and worker are created on first use, inside the running event loop.
+        self._tts_batch_window = self.config.get('tts_batch_window_ms', 0) / 1000
+        self._tts_queue: Optional[asyncio.Queue] = None
+        self._tts_batch_task: Optional[asyncio.Task] = None
+        self._tts_dispatches = set()
+        
+        deferred = [lang for lang in self.supported_languages if lang not in self._loaded_languages]
+        logger.info(
+            f"AayurVoiceService initialized with support for {len(self.supported_languages)} Indian languages; "
+            f"models loaded for {', '.join(self.enabled_languages)}, deferred for {len(deferred)}"
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """Shut down the DSP worker processes and the TTS batch worker"""
+        if self._tts_batch_task is not None:
+            self._tts_batch_task.cancel()
+        self._dsp_pool.shutdown(wait=True, cancel_futures=True)
+    
+    async def _process_audio_off(self, audio_data: bytes) -> bytes:
+        """Run audio preprocessing in the DSP pool so concurrent requests don't share the GIL"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._dsp_pool, self.audio_processor.process_audio_sync, audio_data
+        )
+    
+    async def _preprocess(self, audio_data: bytes) -> bytes:
+        """Preprocess a clip, reusing the result when the same audio was just processed"""
+        key = _audio_fingerprint(audio_data)
+        processed_audio = self._processed_cache.get(key)
+        if processed_audio is not None:
+            self._processed_cache.move_to_end(key)
+            return processed_audio
         
-        logger.info("AayurVoiceService initialized with support for 11 Indian languages")
+        processed_audio = await self._process_audio_off(audio_data)
+        self._processed_cache[key] = processed_audio
+        if len(self._processed_cache) > PROCESSED_AUDIO_CACHE_SIZE:
+            self._processed_cache.popitem(last=False)
+        return processed_audio
     
+    async def _synthesize(self, text: str, language: str,
+                          voice_type: str, speed: float) -> Dict[str, Any]:
+        """Synthesize directly, or through the batch worker when batching is enabled"""
+        if not self._tts_batch_window:
+            return await self.tts_service.synthesize(
+                text=text,
+                language=language,
+                voice_type=voice_type,
+                speed=speed
+            )
+        
+        if self._tts_batch_task is None or self._tts_batch_task.done():
+            self._tts_queue = asyncio.Queue()
+            self._tts_batch_task = asyncio.create_task(self._tts_batch_worker())
+        future = asyncio.get_running_loop().create_future()
+        await self._tts_queue.put(((language, voice_type, speed), text, future))
+        return await future
+    
+    async def _tts_batch_worker(self):
+        """Collect TTS requests for one window, then dispatch them grouped by voice settings"""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._tts_queue.get()]
+            deadline = loop.time() + self._tts_batch_window
+            while len(items) < TTS_BATCH_MAX_SIZE and (remaining := deadline - loop.time()) > 0:
+                try:
+                    items.append(await asyncio.wait_for(self._tts_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            groups: Dict[tuple, list] = {}
+            for params, text, future in items:
+                groups.setdefault(params, []).append((text, future))
+            for params, group in groups.items():
+                task = asyncio.create_task(self._dispatch_tts_batch(params, group))
+                self._tts_dispatches.add(task)
+                task.add_done_callback(self._tts_dispatches.discard)
+    
+    async def _dispatch_tts_batch(self, params: tuple, group: list):
+        """Synthesize one group of batched requests and resolve their futures"""
+        language, voice_type, speed = params
+        try:
+            results = await self.tts_service.synthesize_batch(
+                [text for text, _ in group],
+                language=language,
+                voice_type=voice_type,
+                speed=speed
+            )
+        except Exception as e:
+            for _, future in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(group, results):
+            if not future.done():
+                future.set_result(result)
+    
+    async def _ensure_language_loaded(self, language: str):
+        """Load a language's recognition models on first use, once even under concurrent requests"""
+        if language in self._loaded_languages:
+            return
+        async with self._language_lock:
+            if language in self._loaded_languages:
+                return
+            self.stt_service.load_language(language)
+            self._loaded_languages.add(language)
+            logger.info(f"Loaded voice models for deferred language: {language}")
+    
+    @service_result('Speech recognition', echo=('language',), text='')
     async def speech_to_text(self, audio_data: bytes, 
                            language: str = 'en',
-                           context: str = 'general') -> Dict[str, Any]:
+                           context: str = 'general',
+                           skip_preprocessing: bool = False) -> Dict[str, Any]:
         """
         Convert speech to text with language detection
         
@@ -53,44 +440,65 @@ class AayurVoiceService:
             audio_data: Raw audio bytes
             language: Target language code
             context: Context for better recognition (consultation, symptoms, etc.)
+            skip_preprocessing: Audio is already denoised and normalized (e.g. by WebRTC)
         
         Returns:
             Dict with transcribed text and metadata
         """
-        try:
-            # Process audio (noise reduction, normalization)
-            processed_audio = await self.audio_processor.process_audio(audio_data)
-            
-            # Detect language if not specified
-            if language == 'auto':
-                detected_lang = await self.stt_service.detect_language(processed_audio)
-                language = detected_lang or 'en'
+        if language != 'auto':
+            await self._ensure_language_loaded(language)
+        
+        # Process audio (noise reduction, normalization)
+        if skip_preprocessing:
+            processed_audio = audio_data
+        else:
+            processed_audio = await self._preprocess(audio_data)
+        
+        if language == 'auto':
+            # Detect the language while speculatively recognizing as English, the common case
+            detect_task = asyncio.create_task(self.stt_service.detect_language(processed_audio))
+            speculative_task = asyncio.create_task(self.stt_service.recognize(
+                audio_data=processed_audio,
+                language='en',
+                context=context
+            ))
+            try:
+                detected_lang = await detect_task
+            except BaseException:
+                speculative_task.cancel()
+                raise
+            language = detected_lang or 'en'
             
+            if language == 'en':
+                result = await speculative_task
+            else:
+                speculative_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await speculative_task
+                await self._ensure_language_loaded(language)
+                result = await self.stt_service.recognize(
+                    audio_data=processed_audio,
+                    language=language,
+                    context=context
+                )
+        else:
             # Convert speech to text
             result = await self.stt_service.recognize(
                 audio_data=processed_audio,
                 language=language,
                 context=context
             )
-            
-            return {
-                'success': True,
-                'text': result['text'],
-                'language': language,
-                'confidence': result['confidence'],
-                'alternatives': result.get('alternatives', []),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            logger.error(f"Speech recognition error: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'text': '',
-                'language': language
-            }
+        
+        return {
+            'success': True,
+            'text': result['text'],
+            'language': language,
+            'confidence': result['confidence'],
+            'alternatives': result.get('alternatives', []),
+            'timestamp': _iso_timestamp()
+        }
     
+    @service_result('Text-to-speech', audio_data=None)
     async def text_to_speech(self, text: str, 
                            language: str = 'en',
                            voice_type: str = 'friendly',
@@ -107,37 +515,74 @@ class AayurVoiceService:
         Returns:
             Dict with audio data and metadata
         """
-        try:
-            # Validate language
-            if language not in self.supported_languages:
-                language = 'en'
-            
-            # Generate speech
-            result = await self.tts_service.synthesize(
-                text=text,
-                language=language,
-                voice_type=voice_type,
-                speed=speed
-            )
-            
-            return {
-                'success': True,
-                'audio_data': result['audio_data'],
-                'audio_format': result['format'],
-                'language': language,
-                'voice_type': voice_type,
-                'duration_seconds': result.get('duration', 0),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            logger.error(f"Text-to-speech error: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'audio_data': None
-            }
+        # Validate language
+        if language not in self._supported_languages_set:
+            language = 'en'
+        
+        # Repeated prompts are served from the cache
+        key = (text, language, voice_type, speed)
+        cached = self._tts_cache.get(key)
+        if cached is not None:
+            self._tts_cache.move_to_end(key)
+            return {**cached, 'timestamp': _iso_timestamp()}
+        
+        # Generate speech
+        result = await self._synthesize(text, language, voice_type, speed)
+        if not result.get('success', True):
+            raise RuntimeError(result.get('error', 'Speech synthesis failed'))
+        
+        response = {
+            'success': True,
+            'audio_data': result['audio_data'],
+            'audio_format': result['format'],
+            'language': language,
+            'voice_type': voice_type,
+            'duration_seconds': result.get('duration', 0)
+        }
+        self._cache_tts(key, response)
+        
+        return {**response, 'timestamp': _iso_timestamp()}
     
+    def _cache_tts(self, key: tuple, response: Dict[str, Any]):
+        """Add a TTS result to the LRU, evicting oldest entries past the byte budget"""
+        size = len(response['audio_data'])
+        if size > TTS_CACHE_MAX_ENTRY_BYTES or key in self._tts_cache:
+            return
+        self._tts_cache[key] = response
+        self._tts_cache_bytes += size
+        while self._tts_cache_bytes > TTS_CACHE_MAX_BYTES:
+            _, evicted = self._tts_cache.popitem(last=False)
+            self._tts_cache_bytes -= len(evicted['audio_data'])
+    
+    async def text_to_speech_stream(self, text: str,
+                                    language: str = 'en',
+                                    voice_type: str = 'friendly',
+                                    speed: float = 1.0) -> AsyncIterator[bytes]:
+        """
+        Convert text to speech, yielding encoded audio chunks as they are synthesized
+        
+        Suited to an HTTP StreamingResponse: playback can start on the first
+        chunk instead of waiting for the whole utterance. Cached phrases are
+        yielded in one piece.
+        """
+        if language not in self._supported_languages_set:
+            language = 'en'
+        
+        cached = self._tts_cache.get((text, language, voice_type, speed))
+        if cached is not None:
+            yield cached['audio_data']
+            return
+        
+        async for chunk, _ in self.tts_service.synthesize_stream(
+            text=text,
+            language=language,
+            voice_type=voice_type,
+            speed=speed
+        ):
+            if chunk:
+                yield chunk
+    
+    @service_result('Voice consultation', user_text='')
     async def voice_consultation(self, user_audio: bytes, 
                                consultation_context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -145,70 +590,144 @@ class AayurVoiceService:
         
         Args:
             user_audio: User's voice recording
-            consultation_context: Context about the consultation
+            consultation_context: Context about the consultation ('preprocessed': True skips audio cleanup)
         
         Returns:
             Dict with AI response in text and audio
         """
-        try:
-            # Step 1: Convert user speech to text
-            stt_result = await self.speech_to_text(
-                user_audio,
-                language=consultation_context.get('language', 'en'),
-                context='consultation'
-            )
-            
-            if not stt_result['success']:
-                return {
-                    'success': False,
-                    'error': 'Could not understand speech',
-                    'user_text': ''
-                }
-            
-            user_text = stt_result['text']
-            detected_language = stt_result['language']
-            
-            # Step 2: Process with voice assistant
-            assistant_response = await self.assistant_service.process_query(
-                user_query=user_text,
-                context=consultation_context,
-                language=detected_language
-            )
-            
-            # Step 3: Convert assistant response to speech
-            tts_result = await self.text_to_speech(
-                text=assistant_response['text_response'],
-                language=detected_language,
-                voice_type=assistant_response.get('voice_type', 'friendly'),
-                speed=assistant_response.get('speech_speed', 1.0)
-            )
-            
-            return {
-                'success': True,
-                'user_input': {
-                    'text': user_text,
-                    'language': detected_language,
-                    'confidence': stt_result['confidence']
-                },
-                'assistant_response': {
-                    'text': assistant_response['text_response'],
-                    'audio': tts_result['audio_data'] if tts_result['success'] else None,
-                    'audio_format': tts_result.get('audio_format'),
-                    'next_action': assistant_response.get('next_action'),
-                    'requires_input': assistant_response.get('requires_input', False)
-                },
-                'consultation_step': assistant_response.get('consultation_step'),
-                'timestamp': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            logger.error(f"Voice consultation error: {e}")
+        # Step 1: Convert user speech to text
+        stt_result = await self.speech_to_text(
+            user_audio,
+            language=consultation_context.get('language', 'en'),
+            context='consultation',
+            skip_preprocessing=consultation_context.get('preprocessed', False)
+        )
+        
+        if not stt_result['success']:
             return {
                 'success': False,
-                'error': str(e),
+                'error': 'Could not understand speech',
                 'user_text': ''
             }
+        
+        user_text = stt_result['text']
+        detected_language = stt_result['language']
+        
+        # Step 2: Process with voice assistant
+        assistant_response = await self.assistant_service.process_query(
+            user_query=user_text,
+            context=consultation_context,
+            language=detected_language
+        )
+        
+        # Step 3: Convert assistant response to speech
+        tts_result = await self.text_to_speech(
+            text=assistant_response['text_response'],
+            language=detected_language,
+            voice_type=assistant_response.get('voice_type', 'friendly'),
+            speed=assistant_response.get('speech_speed', 1.0)
+        )
+        
+        return {
+            'success': True,
+            'user_input': {
+                'text': user_text,
+                'language': detected_language,
+                'confidence': stt_result['confidence']
+            },
+            'assistant_response': {
+                'text': assistant_response['text_response'],
+                'audio': tts_result['audio_data'] if tts_result['success'] else None,
+                'audio_format': tts_result.get('audio_format'),
+                'next_action': assistant_response.get('next_action'),
+                'requires_input': assistant_response.get('requires_input', False)
+            },
+            'consultation_step': assistant_response.get('consultation_step'),
+            'timestamp': _iso_timestamp()
+        }
+    
+    async def voice_consultation_stream(self, user_audio: bytes,
+                                        consultation_context: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """
+        Voice consultation that streams the spoken reply
+        
+        The assistant's text is spoken sentence by sentence while it is still
+        being generated, so playback can start before the full reply exists.
+        
+        Args:
+            user_audio: User's voice recording
+            consultation_context: Context about the consultation ('preprocessed': True skips audio cleanup)
+        
+        Yields:
+            Encoded audio for each spoken chunk of the reply
+        """
+        stt_result = await self.speech_to_text(
+            user_audio,
+            language=consultation_context.get('language', 'en'),
+            context='consultation',
+            skip_preprocessing=consultation_context.get('preprocessed', False)
+        )
+        if not stt_result['success']:
+            raise ValueError('Could not understand speech')
+        
+        user_text = stt_result['text']
+        language = stt_result['language']
+        text_queue: asyncio.Queue = asyncio.Queue()
+        audio_queue: asyncio.Queue = asyncio.Queue()
+        
+        async def produce_text():
+            try:
+                tokens = self._assistant_tokens(user_text, consultation_context, language)
+                async for chunk in _speech_chunks(tokens):
+                    await text_queue.put(chunk)
+            finally:
+                await text_queue.put(None)
+        
+        async def produce_audio():
+            try:
+                while (chunk := await text_queue.get()) is not None:
+                    try:
+                        async for audio in self.text_to_speech_stream(
+                            text=chunk,
+                            language=language,
+                            voice_type=consultation_context.get('voice_type', 'friendly'),
+                            speed=consultation_context.get('speech_speed', 1.0)
+                        ):
+                            await audio_queue.put(audio)
+                    except Exception as e:
+                        logger.error(f"Text-to-speech error: {e}")
+            finally:
+                await audio_queue.put(None)
+        
+        tasks = [asyncio.create_task(produce_text()), asyncio.create_task(produce_audio())]
+        try:
+            while (audio := await audio_queue.get()) is not None:
+                yield audio
+            # Surface any producer failure once the stream is drained
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _assistant_tokens(self, user_text: str, context: Dict[str, Any],
+                                language: str) -> AsyncIterator[str]:
+        """Assistant reply as a token stream, falling back to the whole reply at once"""
+        stream_query = getattr(self.assistant_service, 'stream_query', None)
+        if stream_query is not None:
+            async for token in stream_query(user_query=user_text, context=context, language=language):
+                yield token
+            return
+        
+        assistant_response = await self.assistant_service.process_query(
+            user_query=user_text,
+            context=context,
+            language=language
+        )
+        # Split the finished reply so its first sentence is synthesized on its own
+        for sentence in SENTENCE_SPLIT.split(assistant_response['text_response']):
+            yield sentence + ' '
     
+    @service_result('Audio report generation')
     async def generate_audio_report(self, report_data: Dict[str, Any],
                                   language: str = 'en') -> Dict[str, Any]:
         """
@@ -221,45 +740,60 @@ class AayurVoiceService:
         Returns:
             Dict with audio report
         """
-        try:
-            # Format report for audio
-            audio_text = self._format_report_for_audio(report_data, language)
-            
-            # Generate speech
-            tts_result = await self.text_to_speech(
-                text=audio_text,
-                language=language,
-                voice_type='professional',
-                speed=0.9  # Slightly slower for reports
-            )
-            
-            if not tts_result['success']:
-                return {
-                    'success': False,
-                    'error': 'Failed to generate audio report'
-                }
-            
-            # Add chapter markers for navigation
-            chapters = self._create_audio_chapters(report_data)
-            
-            return {
-                'success': True,
-                'audio_data': tts_result['audio_data'],
-                'audio_format': tts_result['audio_format'],
-                'duration_seconds': tts_result['duration_seconds'],
-                'chapters': chapters,
-                'language': language,
-                'timestamp': datetime.now().isoformat(),
-                'report_id': report_data.get('report_id', '')
-            }
-            
-        except Exception as e:
-            logger.error(f"Audio report generation error: {e}")
+        # Format report for audio
+        sections = self._report_sections(report_data, language)
+        audio_text = '\n\n'.join(sections)
+        
+        # Generate speech
+        tts_result = await self.text_to_speech(
+            text=audio_text,
+            language=language,
+            voice_type='professional',
+            speed=0.9  # Slightly slower for reports
+        )
+        
+        if not tts_result['success']:
             return {
                 'success': False,
-                'error': str(e)
+                'error': 'Failed to generate audio report'
             }
+        
+        # Add chapter markers for navigation
+        chapters = self._create_audio_chapters(sections, tts_result['duration_seconds'])
+        
+        return {
+            'success': True,
+            'audio_data': tts_result['audio_data'],
+            'audio_format': tts_result['audio_format'],
+            'duration_seconds': tts_result['duration_seconds'],
+            'chapters': chapters,
+            'language': language,
+            'timestamp': _iso_timestamp(),
+            'report_id': report_data.get('report_id', '')
+        }
     
+    async def generate_audio_report_stream(self, report_data: Dict[str, Any],
+                                           language: str = 'en') -> AsyncIterator[bytes]:
+        """
+        Audio version of a diagnosis report, streamed as it is synthesized
+        
+        Args:
+            report_data: Report data from consultation
+            language: Target language for audio
+        
+        Yields:
+            Encoded audio chunks of the spoken report
+        """
+        audio_text = self._format_report_for_audio(report_data, language)
+        async for chunk in self.text_to_speech_stream(
+            text=audio_text,
+            language=language,
+            voice_type='professional',
+            speed=0.9  # Slightly slower for reports
+        ):
+            yield chunk
+    
+    @service_result('Voice symptom input')
     async def voice_symptom_input(self, audio_data: bytes,
                                 language: str = 'en') -> Dict[str, Any]:
         """
@@ -272,42 +806,35 @@ class AayurVoiceService:
         Returns:
             Dict with extracted symptoms and severity
         """
-        try:
-            # Convert speech to text
-            stt_result = await self.speech_to_text(
-                audio_data,
-                language=language,
-                context='medical_symptoms'
-            )
-            
-            if not stt_result['success']:
-                return {
-                    'success': False,
-                    'error': 'Could not understand symptom description'
-                }
-            
-            # Extract symptoms from text
-            symptom_text = stt_result['text']
-            extracted_symptoms = await self._extract_symptoms_from_text(
-                symptom_text,
-                language
-            )
-            
-            return {
-                'success': True,
-                'original_text': symptom_text,
-                'extracted_symptoms': extracted_symptoms,
-                'language': language,
-                'confidence': stt_result['confidence']
-            }
-            
-        except Exception as e:
-            logger.error(f"Voice symptom input error: {e}")
+        # Convert speech to text
+        stt_result = await self.speech_to_text(
+            audio_data,
+            language=language,
+            context='medical_symptoms'
+        )
+        
+        if not stt_result['success']:
             return {
                 'success': False,
-                'error': str(e)
+                'error': 'Could not understand symptom description'
             }
+        
+        # Extract symptoms from text
+        symptom_text = stt_result['text']
+        extracted_symptoms = await self._extract_symptoms_from_text(
+            symptom_text,
+            language
+        )
+        
+        return {
+            'success': True,
+            'original_text': symptom_text,
+            'extracted_symptoms': extracted_symptoms,
+            'language': language,
+            'confidence': stt_result['confidence']
+        }
     
+    @service_result('Voice guidance')
     async def voice_guided_tongue_capture(self, instructions_language: str = 'en') -> Dict[str, Any]:
         """
         Provide voice guidance for tongue image capture
@@ -318,162 +845,117 @@ class AayurVoiceService:
         Returns:
             Dict with audio guidance steps
         """
-        try:
-            # Tongue capture instructions
-            instructions = [
-                {
-                    'text': 'Please open your mouth and extend your tongue naturally.',
-                    'wait_time': 5,
-                    'voice_type': 'calm'
-                },
-                {
-                    'text': 'Make sure your tongue is relaxed, not strained.',
-                    'wait_time': 3,
-                    'voice_type': 'calm'
-                },
-                {
-                    'text': 'Try to keep your tongue in the center, not tilted.',
-                    'wait_time': 3,
-                    'voice_type': 'calm'
-                },
-                {
-                    'text': 'Ready? I will count down from 3. Please hold still.',
-                    'wait_time': 2,
-                    'voice_type': 'clear'
-                },
-                {
-                    'text': '3... 2... 1...',
-                    'wait_time': 3,
-                    'voice_type': 'clear'
-                },
-                {
-                    'text': 'Perfect! You can relax now.',
-                    'wait_time': 0,
-                    'voice_type': 'friendly'
-                }
-            ]
-            
-            # Generate audio for each instruction
-            guidance_audio = []
-            for i, instruction in enumerate(instructions):
-                tts_result = await self.text_to_speech(
-                    text=instruction['text'],
-                    language=instructions_language,
-                    voice_type=instruction['voice_type'],
-                    speed=0.9
-                )
-                
-                if tts_result['success']:
-                    guidance_audio.append({
-                        'step': i + 1,
-                        'audio': tts_result['audio_data'],
-                        'text': instruction['text'],
-                        'wait_time': instruction['wait_time'],
-                        'format': tts_result['audio_format']
-                    })
-            
-            return {
-                'success': True,
-                'guidance_steps': guidance_audio,
-                'total_steps': len(instructions),
-                'language': instructions_language
-            }
-            
-        except Exception as e:
-            logger.error(f"Voice guidance error: {e}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
-    
-    def _format_report_for_audio(self, report_data: Dict[str, Any], language: str) -> str:
-        """Format text report for audio consumption"""
-        # Extract key information
-        patient_name = report_data.get('patient_name', 'Patient')
-        dominant_dosha = report_data.get('dominant_dosha', '').capitalize()
-        imbalance = report_data.get('imbalance_level', '').capitalize()
-        
-        # Recommendations
-        dietary = report_data.get('dietary_recommendations', [])[:3]
-        lifestyle = report_data.get('lifestyle_recommendations', [])[:3]
-        herbs = report_data.get('herbal_recommendations', [])[:3]
+        instructions = _TONGUE_INSTRUCTIONS
+        tts_results = await self._tongue_guidance_audio(instructions_language)
         
-        # Format audio text
-        audio_text = f"""
-        Aayur AI Diagnosis Report for {patient_name}.
+        # gather preserves submission order, so steps stay in sequence
+        guidance_audio = []
+        for i, (instruction, tts_result) in enumerate(zip(instructions, tts_results)):
+            if tts_result['success']:
+                guidance_audio.append({
+                    'step': i + 1,
+                    'audio': tts_result['audio_data'],
+                    'text': instruction['text'],
+                    'wait_time': instruction['wait_time'],
+                    'format': tts_result['audio_format']
+                })
         
-        Your Ayurvedic analysis shows {imbalance} {dominant_dosha} imbalance.
-        
-        Dietary Recommendations:
-        {'. '.join(dietary)}
+        return {
+            'success': True,
+            'guidance_steps': guidance_audio,
+            'total_steps': len(instructions),
+            'language': instructions_language
+        }
+    
+    async def prewarm_tongue_guidance(self, languages: Optional[List[str]] = None):
+        """
+        Synthesize the tongue capture guidance ahead of time so it is served from the TTS cache
         
-        Lifestyle Changes:
-        {'. '.join(lifestyle)}
+        Meant for application startup; defaults to the enabled languages.
+        """
+        for language in languages or self.enabled_languages:
+            tts_results = await self._tongue_guidance_audio(language)
+            ready = sum(1 for tts_result in tts_results if tts_result['success'])
+            logger.info(f"Prewarmed tongue guidance for {language}: {ready}/{len(tts_results)} steps")
+    
+    async def _tongue_guidance_audio(self, language: str) -> List[Dict[str, Any]]:
+        """TTS results for every tongue capture instruction, in step order"""
+        # Generate audio for all instructions concurrently, bounded so the TTS backend isn't flooded
+        semaphore = asyncio.Semaphore(self.config.get('tts_concurrency', 3))
         
-        Herbal Remedies:
-        {'. '.join(herbs)}
+        async def synthesize(instruction):
+            async with semaphore:
+                return await self.text_to_speech(
+                    text=instruction['text'],
+                    language=language,
+                    voice_type=instruction['voice_type'],
+                    speed=TONGUE_GUIDANCE_SPEED
+                )
         
-        This concludes your Aayur AI diagnosis report.
-        For personalized treatment, consult a qualified Ayurvedic practitioner.
+        return await asyncio.gather(*(synthesize(instruction) for instruction in _TONGUE_INSTRUCTIONS))
+    
+    def _format_report_for_audio(self, report_data: Dict[str, Any], language: str) -> str:
+        """Format text report for audio consumption, in the report's language"""
+        return '\n\n'.join(self._report_sections(report_data, language))
+    
+    def _report_sections(self, report_data: Dict[str, Any], language: str) -> List[str]:
+        """Spoken report text, one entry per chapter"""
+        templates = REPORT_TEMPLATES.get(language, REPORT_TEMPLATES['en'])
+        fields = {
+            'patient_name': report_data.get('patient_name', 'Patient'),
+            'dominant_dosha': report_data.get('dominant_dosha', '').capitalize(),
+            'imbalance': report_data.get('imbalance_level', '').capitalize(),
+            'dietary': '. '.join(report_data.get('dietary_recommendations', [])[:3]),
+            'lifestyle': '. '.join(report_data.get('lifestyle_recommendations', [])[:3]),
+            'herbs': '. '.join(report_data.get('herbal_recommendations', [])[:3])
+        }
+        return [template.format_map(fields) for template in templates]
+    
+    def _create_audio_chapters(self, sections: List[str], duration_seconds: float) -> List[Dict[str, Any]]:
         """
+        Create chapter markers for audio navigation
         
-        return audio_text.strip()
-    
-    def _create_audio_chapters(self, report_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Create chapter markers for audio navigation"""
-        chapters = [
-            {
-                'title': 'Introduction',
-                'start_time': 0,
-                'duration': 10
-            },
-            {
-                'title': 'Dosha Analysis',
-                'start_time': 10,
-                'duration': 30
-            },
-            {
-                'title': 'Dietary Recommendations',
-                'start_time': 40,
-                'duration': 45
-            },
-            {
-                'title': 'Lifestyle Changes',
-                'start_time': 85,
-                'duration': 45
-            },
-            {
-                'title': 'Herbal Remedies',
-                'start_time': 130,
-                'duration': 40
-            },
+        The engines report no sentence timings, so the synthesized duration is
+        split across sections in proportion to their text length.
+        """
+        lengths = np.fromiter(map(len, sections), dtype=np.float64, count=len(sections))
+        durations = lengths * (duration_seconds / max(lengths.sum(), 1.0))
+        starts = np.cumsum(durations) - durations
+        return [
             {
-                'title': 'Conclusion',
-                'start_time': 170,
-                'duration': 20
+                'title': title,
+                'start_time': round(float(start), 2),
+                'duration': round(float(duration), 2)
             }
+            for title, start, duration in zip(_AUDIO_CHAPTER_TITLES, starts, durations)
         ]
-        
-        return chapters
     
     async def _extract_symptoms_from_text(self, text: str, language: str) -> List[Dict[str, Any]]:
-        """Extract symptoms and severity from text description"""
-        # This would use NLP to extract symptoms
-        # For now, return mock data
+        """Extract symptoms from text description with the precompiled per-language scanner"""
         return [
             {
-                'symptom': 'headache',
-                'severity': 7,
-                'confidence': 0.8,
-                'duration': '2 days'
-            },
-            {
-                'symptom': 'fatigue',
-                'severity': 6,
-                'confidence': 0.7,
-                'duration': '1 week'
+                'symptom': symptom,
+                'severity': None,
+                'confidence': 0.75,
+                'duration': None
             }
+            for symptom in _match_symptoms(text, language)
         ]
 
-# Global voice service instance
-voice_service = AayurVoiceService()
\ No newline at end of file
+# Global voice service instance, created on first use so importing this module stays cheap
+_voice_service: Optional[AayurVoiceService] = None
+
+
+def get_voice_service() -> AayurVoiceService:
+    """Shared AayurVoiceService, constructed on the first call"""
+    global _voice_service
+    if _voice_service is None:
+        _voice_service = AayurVoiceService()
+    return _voice_service
+
+
+def __getattr__(name: str):
+    # Keeps `from voice_services.voice_service import voice_service` working
+    if name == 'voice_service':
+        return get_voice_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")